@@ -0,0 +1,155 @@
+"""Migration 002: Backfill comments_by_author and drop the author index.
+
+Comment counts per author used to come from a secondary index on
+comments.author_id. New comments are now also written to the
+comments_by_author table, partitioned by author_id. This migration:
+- creates comments_by_author if it does not exist yet
+- copies every existing comment into it
+- drops the comments_author_idx secondary index
+
+Safe to re-run: inserts are idempotent upserts and the DDL uses IF (NOT) EXISTS.
+
+Usage:
+    cd api && uv run python -m scripts.migrations.002_backfill_comments_by_author
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import structlog
+from cassandra.auth import PlainTextAuthProvider
+from cassandra_asyncio.cluster import Cluster
+
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.comments.models import COMMENTS_BY_AUTHOR_TABLE_CQL
+from src.config.settings import get_settings
+
+
+logger = structlog.get_logger(__name__)
+
+
+SELECT_COMMENTS_CQL = """
+SELECT author_id, created_at, comment_id, lesson_id, parent_id, author_name,
+       author_avatar, content, is_edited, is_deleted, reply_count, rating,
+       is_review
+FROM {keyspace}.comments
+"""
+
+INSERT_COMMENT_BY_AUTHOR_CQL = """
+INSERT INTO {keyspace}.comments_by_author
+(author_id, created_at, comment_id, lesson_id, parent_id, author_name,
+ author_avatar, content, is_edited, is_deleted, reply_count, rating, is_review)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+DROP_AUTHOR_INDEX_CQL = "DROP INDEX IF EXISTS {keyspace}.comments_author_idx"
+
+
+async def migrate_up(session, keyspace: str) -> int:
+    """Apply migration - backfill comments_by_author, then drop the index.
+
+    The index is only dropped after every row is copied, so author counts
+    stay correct while the migration runs.
+
+    Args:
+        session: Cassandra session with aexecute support
+        keyspace: Target keyspace
+
+    Returns:
+        Number of comments copied
+    """
+    await session.aexecute(COMMENTS_BY_AUTHOR_TABLE_CQL.format(keyspace=keyspace))
+
+    insert = session.prepare(INSERT_COMMENT_BY_AUTHOR_CQL.format(keyspace=keyspace))
+    rows = await session.aexecute(SELECT_COMMENTS_CQL.format(keyspace=keyspace))
+
+    copied = 0
+    for row in rows:
+        await session.aexecute(
+            insert,
+            [
+                row.author_id,
+                row.created_at,
+                row.comment_id,
+                row.lesson_id,
+                row.parent_id,
+                row.author_name,
+                row.author_avatar,
+                row.content,
+                row.is_edited,
+                row.is_deleted,
+                row.reply_count,
+                row.rating,
+                row.is_review,
+            ],
+        )
+        copied += 1
+
+    logger.info("migration_backfill_done", table="comments_by_author", rows=copied)
+
+    await session.aexecute(DROP_AUTHOR_INDEX_CQL.format(keyspace=keyspace))
+    logger.info("migration_applied", statement="drop comments_author_idx")
+
+    return copied
+
+
+async def migrate_down(session, keyspace: str) -> None:
+    """Rollback migration - recreate the author index.
+
+    comments_by_author is left in place; the application keeps writing to it.
+    """
+    await session.aexecute(
+        f"CREATE INDEX IF NOT EXISTS comments_author_idx "
+        f"ON {keyspace}.comments (author_id)"
+    )
+
+
+async def run_migration() -> None:
+    """Run the migration."""
+    settings = get_settings()
+    keyspace = settings.cassandra_keyspace
+
+    logger.info(
+        "migration_starting",
+        migration="002_backfill_comments_by_author",
+        keyspace=keyspace,
+        hosts=settings.cassandra_hosts,
+    )
+
+    # Setup auth provider if credentials configured
+    auth_provider = None
+    if settings.cassandra_username and settings.cassandra_password:
+        auth_provider = PlainTextAuthProvider(
+            username=settings.cassandra_username,
+            password=settings.cassandra_password,
+        )
+
+    # Connect to cluster
+    cluster = Cluster(
+        contact_points=settings.cassandra_hosts,
+        port=settings.cassandra_port,
+        auth_provider=auth_provider,
+        protocol_version=settings.cassandra_protocol_version,
+    )
+
+    session = cluster.connect()
+    session.set_keyspace(keyspace)
+
+    try:
+        copied = await migrate_up(session, keyspace)
+        logger.info(
+            "migration_completed",
+            migration="002_backfill_comments_by_author",
+            copied=copied,
+        )
+    finally:
+        session.shutdown()
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,100 @@
+"""Migration 003: Switch moderator_audit_log to time-window compaction.
+
+moderator_audit_log is append-only with a 1 year TTL. New deployments create
+it with TimeWindowCompactionStrategy; this migration applies the same table
+options to existing clusters, where CREATE TABLE IF NOT EXISTS is a no-op.
+
+Safe to re-run: ALTER TABLE WITH options is idempotent.
+
+Usage:
+    cd api && uv run python -m scripts.migrations.003_audit_log_twcs
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import structlog
+from cassandra.auth import PlainTextAuthProvider
+from cassandra_asyncio.cluster import Cluster
+
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.config.settings import get_settings
+
+
+logger = structlog.get_logger(__name__)
+
+
+ALTER_AUDIT_LOG_CQL = """
+ALTER TABLE {keyspace}.moderator_audit_log
+WITH compaction = {{'class': 'TimeWindowCompactionStrategy', 'compaction_window_unit': 'DAYS', 'compaction_window_size': 14}}
+AND gc_grace_seconds = 86400
+"""
+
+ROLLBACK_AUDIT_LOG_CQL = """
+ALTER TABLE {keyspace}.moderator_audit_log
+WITH compaction = {{'class': 'SizeTieredCompactionStrategy'}}
+AND gc_grace_seconds = 864000
+"""
+
+
+async def migrate_up(session, keyspace: str) -> None:
+    """Apply migration - enable TWCS on moderator_audit_log.
+
+    Args:
+        session: Cassandra session with aexecute support
+        keyspace: Target keyspace
+    """
+    await session.aexecute(ALTER_AUDIT_LOG_CQL.format(keyspace=keyspace))
+    logger.info("migration_applied", table="moderator_audit_log")
+
+
+async def migrate_down(session, keyspace: str) -> None:
+    """Rollback migration - restore the default compaction and gc grace."""
+    await session.aexecute(ROLLBACK_AUDIT_LOG_CQL.format(keyspace=keyspace))
+
+
+async def run_migration() -> None:
+    """Run the migration."""
+    settings = get_settings()
+    keyspace = settings.cassandra_keyspace
+
+    logger.info(
+        "migration_starting",
+        migration="003_audit_log_twcs",
+        keyspace=keyspace,
+        hosts=settings.cassandra_hosts,
+    )
+
+    # Setup auth provider if credentials configured
+    auth_provider = None
+    if settings.cassandra_username and settings.cassandra_password:
+        auth_provider = PlainTextAuthProvider(
+            username=settings.cassandra_username,
+            password=settings.cassandra_password,
+        )
+
+    # Connect to cluster
+    cluster = Cluster(
+        contact_points=settings.cassandra_hosts,
+        port=settings.cassandra_port,
+        auth_provider=auth_provider,
+        protocol_version=settings.cassandra_protocol_version,
+    )
+
+    session = cluster.connect()
+    session.set_keyspace(keyspace)
+
+    try:
+        await migrate_up(session, keyspace)
+        logger.info("migration_completed", migration="003_audit_log_twcs")
+    finally:
+        session.shutdown()
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
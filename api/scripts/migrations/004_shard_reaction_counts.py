@@ -0,0 +1,146 @@
+"""Migration 004: Move reaction counts to the sharded counter table.
+
+Reaction counts used to live in comment_reaction_counts, one counter cell
+per (comment_id, reaction_type). The application now writes to
+comment_reaction_count_shards, which spreads each count over several shard
+rows. This migration:
+- creates comment_reaction_count_shards if it does not exist yet
+- copies every legacy count into a reserved backfill shard (-1), which
+  the application never writes to
+
+Counter updates are not idempotent, so each copy adds only the difference
+between the legacy count and what the backfill shard already holds. Safe to
+re-run once the application has stopped writing to the legacy table.
+
+Usage:
+    cd api && uv run python -m scripts.migrations.004_shard_reaction_counts
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import structlog
+from cassandra.auth import PlainTextAuthProvider
+from cassandra_asyncio.cluster import Cluster
+
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.comments.models import REACTION_COUNTS_TABLE_CQL
+from src.config.settings import get_settings
+
+
+logger = structlog.get_logger(__name__)
+
+
+BACKFILL_SHARD = -1
+
+SELECT_LEGACY_COUNTS_CQL = """
+SELECT comment_id, reaction_type, count
+FROM {keyspace}.comment_reaction_counts
+"""
+
+SELECT_BACKFILL_SHARD_CQL = """
+SELECT count FROM {keyspace}.comment_reaction_count_shards
+WHERE comment_id = ? AND reaction_type = ? AND shard = ?
+"""
+
+ADD_TO_BACKFILL_SHARD_CQL = """
+UPDATE {keyspace}.comment_reaction_count_shards
+SET count = count + ?
+WHERE comment_id = ? AND reaction_type = ? AND shard = ?
+"""
+
+
+async def migrate_up(session, keyspace: str) -> int:
+    """Apply migration - copy legacy counts into the backfill shard.
+
+    Args:
+        session: Cassandra session with aexecute support
+        keyspace: Target keyspace
+
+    Returns:
+        Number of counters adjusted
+    """
+    await session.aexecute(REACTION_COUNTS_TABLE_CQL.format(keyspace=keyspace))
+
+    select_shard = session.prepare(SELECT_BACKFILL_SHARD_CQL.format(keyspace=keyspace))
+    add_to_shard = session.prepare(ADD_TO_BACKFILL_SHARD_CQL.format(keyspace=keyspace))
+    rows = await session.aexecute(SELECT_LEGACY_COUNTS_CQL.format(keyspace=keyspace))
+
+    adjusted = 0
+    for row in rows:
+        current = await session.aexecute(
+            select_shard, [row.comment_id, row.reaction_type, BACKFILL_SHARD]
+        )
+        delta = (row.count or 0) - (current[0].count if current else 0)
+        if delta:
+            await session.aexecute(
+                add_to_shard,
+                [delta, row.comment_id, row.reaction_type, BACKFILL_SHARD],
+            )
+            adjusted += 1
+
+    logger.info(
+        "migration_backfill_done",
+        table="comment_reaction_count_shards",
+        rows=adjusted,
+    )
+    return adjusted
+
+
+async def migrate_down(session, keyspace: str) -> None:
+    """Rollback migration - nothing to undo.
+
+    The legacy comment_reaction_counts table is left untouched, so rolling
+    back the application is enough; the sharded table is kept for re-runs.
+    """
+
+
+async def run_migration() -> None:
+    """Run the migration."""
+    settings = get_settings()
+    keyspace = settings.cassandra_keyspace
+
+    logger.info(
+        "migration_starting",
+        migration="004_shard_reaction_counts",
+        keyspace=keyspace,
+        hosts=settings.cassandra_hosts,
+    )
+
+    # Setup auth provider if credentials configured
+    auth_provider = None
+    if settings.cassandra_username and settings.cassandra_password:
+        auth_provider = PlainTextAuthProvider(
+            username=settings.cassandra_username,
+            password=settings.cassandra_password,
+        )
+
+    # Connect to cluster
+    cluster = Cluster(
+        contact_points=settings.cassandra_hosts,
+        port=settings.cassandra_port,
+        auth_provider=auth_provider,
+        protocol_version=settings.cassandra_protocol_version,
+    )
+
+    session = cluster.connect()
+    session.set_keyspace(keyspace)
+
+    try:
+        adjusted = await migrate_up(session, keyspace)
+        logger.info(
+            "migration_completed",
+            migration="004_shard_reaction_counts",
+            adjusted=adjusted,
+        )
+    finally:
+        session.shutdown()
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,162 @@
+"""Migration 005: Move already moderated reports out of the pending partition.
+
+Moderation used to update comment_reports.status but leave the report's
+comment_reports_by_status row under 'pending', so reports moderated before
+the status move was introduced still show up in the moderation queue.
+Re-moderating them cannot clear them either: the application deletes from
+the partition of the status stored in comment_reports. This migration:
+- reads every row of the 'pending' partition
+- looks up the report's current status in comment_reports
+- for reports no longer pending, deletes the pending row and inserts the
+  row under the report's current status, in one logged batch
+
+Rows whose report is missing from comment_reports are left untouched.
+
+Safe to re-run: moved rows are no longer in the pending partition, and the
+insert is an idempotent upsert.
+
+Usage:
+    cd api && uv run python -m scripts.migrations.005_clear_stale_pending_reports
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import structlog
+from cassandra.auth import PlainTextAuthProvider
+from cassandra_asyncio.cluster import Cluster
+
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.comments.models import ReportStatus
+from src.config.settings import get_settings
+
+
+logger = structlog.get_logger(__name__)
+
+
+SELECT_PENDING_ROWS_CQL = """
+SELECT status, created_at, report_id, comment_id, lesson_id, reporter_id, reason
+FROM {keyspace}.comment_reports_by_status
+WHERE status = ?
+"""
+
+SELECT_REPORT_STATUS_CQL = """
+SELECT status FROM {keyspace}.comment_reports
+WHERE comment_id = ? AND report_id = ?
+"""
+
+MOVE_REPORT_CQL = """
+BEGIN BATCH
+DELETE FROM {keyspace}.comment_reports_by_status
+WHERE status = ? AND created_at = ? AND report_id = ?;
+INSERT INTO {keyspace}.comment_reports_by_status
+(status, created_at, report_id, comment_id, lesson_id, reporter_id, reason)
+VALUES (?, ?, ?, ?, ?, ?, ?);
+APPLY BATCH
+"""
+
+
+async def migrate_up(session, keyspace: str) -> int:
+    """Apply migration - move moderated reports out of 'pending'.
+
+    Args:
+        session: Cassandra session with aexecute support
+        keyspace: Target keyspace
+
+    Returns:
+        Number of reports moved
+    """
+    select_pending = session.prepare(SELECT_PENDING_ROWS_CQL.format(keyspace=keyspace))
+    select_status = session.prepare(SELECT_REPORT_STATUS_CQL.format(keyspace=keyspace))
+    move_report = session.prepare(MOVE_REPORT_CQL.format(keyspace=keyspace))
+
+    pending = ReportStatus.PENDING.value
+    rows = await session.aexecute(select_pending, [pending])
+
+    moved = 0
+    for row in rows:
+        reports = await session.aexecute(select_status, [row.comment_id, row.report_id])
+        if not reports or reports[0].status == pending:
+            continue
+        await session.aexecute(
+            move_report,
+            [
+                pending,
+                row.created_at,
+                row.report_id,
+                reports[0].status,
+                row.created_at,
+                row.report_id,
+                row.comment_id,
+                row.lesson_id,
+                row.reporter_id,
+                row.reason,
+            ],
+        )
+        moved += 1
+
+    logger.info(
+        "migration_backfill_done",
+        table="comment_reports_by_status",
+        rows=moved,
+    )
+    return moved
+
+
+async def migrate_down(session, keyspace: str) -> None:
+    """Rollback migration - nothing to undo.
+
+    Moved rows sit under the status already stored in comment_reports,
+    which is where the application now expects them.
+    """
+
+
+async def run_migration() -> None:
+    """Run the migration."""
+    settings = get_settings()
+    keyspace = settings.cassandra_keyspace
+
+    logger.info(
+        "migration_starting",
+        migration="005_clear_stale_pending_reports",
+        keyspace=keyspace,
+        hosts=settings.cassandra_hosts,
+    )
+
+    # Setup auth provider if credentials configured
+    auth_provider = None
+    if settings.cassandra_username and settings.cassandra_password:
+        auth_provider = PlainTextAuthProvider(
+            username=settings.cassandra_username,
+            password=settings.cassandra_password,
+        )
+
+    # Connect to cluster
+    cluster = Cluster(
+        contact_points=settings.cassandra_hosts,
+        port=settings.cassandra_port,
+        auth_provider=auth_provider,
+        protocol_version=settings.cassandra_protocol_version,
+    )
+
+    session = cluster.connect()
+    session.set_keyspace(keyspace)
+
+    try:
+        moved = await migrate_up(session, keyspace)
+        logger.info(
+            "migration_completed",
+            migration="005_clear_stale_pending_reports",
+            moved=moved,
+        )
+    finally:
+        session.shutdown()
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
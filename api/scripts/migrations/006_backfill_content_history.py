@@ -0,0 +1,159 @@
+"""Migration 006: Backfill comment_content_history from the legacy column.
+
+Edit history used to be stored on the comment row, in the
+comments.content_history column (a list of {"content", "edited_at"} maps).
+Edits are now appended to the comment_content_history table, and
+CommentService.get_content_history only reads that table. This migration:
+- creates comment_content_history if it does not exist yet
+- copies every legacy history entry into it
+
+Clusters created after the move have no content_history column; the
+migration then does nothing. Entries without content or with an unreadable
+edited_at are skipped. The legacy column is left in place.
+
+Safe to re-run: inserts are idempotent upserts keyed by (comment_id, edited_at).
+
+Usage:
+    cd api && uv run python -m scripts.migrations.006_backfill_content_history
+"""
+
+import asyncio
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+import structlog
+from cassandra.auth import PlainTextAuthProvider
+from cassandra_asyncio.cluster import Cluster
+
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.comments.models import COMMENT_CONTENT_HISTORY_TABLE_CQL
+from src.config.settings import get_settings
+
+
+logger = structlog.get_logger(__name__)
+
+
+SELECT_LEGACY_COLUMN_CQL = """
+SELECT column_name FROM system_schema.columns
+WHERE keyspace_name = ? AND table_name = 'comments' AND column_name = 'content_history'
+"""
+
+SELECT_LEGACY_HISTORY_CQL = """
+SELECT comment_id, content_history FROM {keyspace}.comments
+"""
+
+INSERT_HISTORY_CQL = """
+INSERT INTO {keyspace}.comment_content_history
+(comment_id, edited_at, previous_content)
+VALUES (?, ?, ?)
+"""
+
+
+def _parse_edited_at(value: str | None) -> datetime | None:
+    """Parse a legacy ISO edited_at, treating naive values as UTC."""
+    if not value:
+        return None
+    try:
+        edited_at = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return edited_at if edited_at.tzinfo else edited_at.replace(tzinfo=UTC)
+
+
+async def migrate_up(session, keyspace: str) -> int:
+    """Apply migration - copy legacy history entries into the history table.
+
+    Args:
+        session: Cassandra session with aexecute support
+        keyspace: Target keyspace
+
+    Returns:
+        Number of history entries copied
+    """
+    await session.aexecute(COMMENT_CONTENT_HISTORY_TABLE_CQL.format(keyspace=keyspace))
+
+    legacy_column = await session.aexecute(
+        session.prepare(SELECT_LEGACY_COLUMN_CQL), [keyspace]
+    )
+    if not legacy_column:
+        logger.info("migration_skipped", reason="no legacy content_history column")
+        return 0
+
+    insert = session.prepare(INSERT_HISTORY_CQL.format(keyspace=keyspace))
+    rows = await session.aexecute(SELECT_LEGACY_HISTORY_CQL.format(keyspace=keyspace))
+
+    copied = 0
+    for row in rows:
+        for entry in row.content_history or []:
+            edited_at = _parse_edited_at(entry.get("edited_at"))
+            content = entry.get("content")
+            if edited_at is None or content is None:
+                continue
+            await session.aexecute(insert, [row.comment_id, edited_at, content])
+            copied += 1
+
+    logger.info(
+        "migration_backfill_done",
+        table="comment_content_history",
+        rows=copied,
+    )
+    return copied
+
+
+async def migrate_down(session, keyspace: str) -> None:
+    """Rollback migration - nothing to undo.
+
+    The legacy column is never modified, so rolling back the application
+    is enough; the history table is kept for re-runs.
+    """
+
+
+async def run_migration() -> None:
+    """Run the migration."""
+    settings = get_settings()
+    keyspace = settings.cassandra_keyspace
+
+    logger.info(
+        "migration_starting",
+        migration="006_backfill_content_history",
+        keyspace=keyspace,
+        hosts=settings.cassandra_hosts,
+    )
+
+    # Setup auth provider if credentials configured
+    auth_provider = None
+    if settings.cassandra_username and settings.cassandra_password:
+        auth_provider = PlainTextAuthProvider(
+            username=settings.cassandra_username,
+            password=settings.cassandra_password,
+        )
+
+    # Connect to cluster
+    cluster = Cluster(
+        contact_points=settings.cassandra_hosts,
+        port=settings.cassandra_port,
+        auth_provider=auth_provider,
+        protocol_version=settings.cassandra_protocol_version,
+    )
+
+    session = cluster.connect()
+    session.set_keyspace(keyspace)
+
+    try:
+        copied = await migrate_up(session, keyspace)
+        logger.info(
+            "migration_completed",
+            migration="006_backfill_content_history",
+            copied=copied,
+        )
+    finally:
+        session.shutdown()
+        cluster.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -17,6 +17,7 @@ from src.auth.permissions import UserRole, has_permission
 from src.auth.schemas import UserResponse
 from src.auth.security import decode_access_token
 from src.config.settings import Settings, get_settings
+from src.core.client_ip import get_client_info as resolve_client_info
 from src.core.context import set_user_id
 
 
@@ -62,16 +63,8 @@ async def get_client_info(request: Request) -> tuple[str | None, str | None]:
     Returns:
         Tuple of (user_agent, ip_address)
     """
-    user_agent = request.headers.get("user-agent")
-
     # IP detection order: X-Forwarded-For > X-Real-IP > client.host
-    ip_address = (
-        request.headers.get("x-forwarded-for", "").split(",")[0].strip()
-        or request.headers.get("x-real-ip")
-        or (request.client.host if request.client else None)
-    )
-
-    return user_agent, ip_address
+    return resolve_client_info(request)
 
 
 async def get_current_user(
@@ -7,6 +7,7 @@ Business logic for:
 - User queries
 """
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 from uuid import UUID
@@ -609,7 +610,8 @@ class AuthService:
         if not user:
             raise UserNotFoundError
 
-        new_hash = hash_password(new_password)
+        # Argon2 is CPU-bound; hash off the event loop
+        new_hash = await asyncio.to_thread(hash_password, new_password)
         await self.session.aexecute(
             self._update_user_password,
             [new_hash, datetime.now(UTC), user.id],
@@ -659,6 +661,20 @@ class AuthService:
         is_valid, _ = verify_password(password, password_hash)
         return is_valid
 
+    async def verify_password_async(self, password: str, password_hash: str) -> bool:
+        """Verify a password against a hash without blocking the event loop.
+
+        Runs the Argon2 check in a worker thread.
+
+        Args:
+            password: Plain text password
+            password_hash: Stored password hash
+
+        Returns:
+            True if password matches
+        """
+        return await asyncio.to_thread(self.verify_password, password, password_hash)
+
     async def update_user_role(self, user_id: UUID, new_role: UserRole) -> User:
         """Update user role (admin only).
 
@@ -12,17 +12,21 @@ Security Features:
 
 import hashlib
 import secrets
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
+from redis.exceptions import RedisError
+
 from src.core.logging import get_logger
 
 
 if TYPE_CHECKING:
     from cassandra.cluster import Session
+    from redis.asyncio import Redis
 
     from src.auth.service import AuthService
     from src.email.service import EmailService
@@ -156,6 +160,78 @@ CREATE TABLE IF NOT EXISTS {keyspace}.verification_rate_limits (
 """
 
 
+# =============================================================================
+# Email Masking
+# =============================================================================
+
+MIN_LOCAL_EMAIL_LENGTH = 2
+
+
+def mask_email(email: str) -> str:
+    """Mask email for display (e.g. ``j***@example.com``).
+
+    Slices around the last ``@`` instead of splitting into a list.
+    """
+    at = email.rfind("@")
+    stars = "***" if at > MIN_LOCAL_EMAIL_LENGTH else "*"
+    return f"{email[0]}{stars}{email[at:]}"
+
+
+# =============================================================================
+# Redis Rate Limiting
+# =============================================================================
+
+# Token bucket evaluated atomically in Redis (one round trip for all keys).
+# KEYS: bucket keys (email, optionally IP)
+# ARGV: capacity, milliseconds per token, current time in ms
+# Returns {allowed, retry_after_ms}. Tokens are only taken when every key
+# has one available, matching the check-then-increment of the CQL path.
+RATE_LIMIT_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill_ms = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = {}
+local stamps = {}
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    local bucket = redis.call("HMGET", key, "tokens", "ts")
+    local available = tonumber(bucket[1])
+    local ts = tonumber(bucket[2])
+    if available == nil or ts == nil then
+        available = capacity
+        ts = now
+    else
+        local refill = math.floor((now - ts) / refill_ms)
+        if refill > 0 then
+            available = math.min(capacity, available + refill)
+            ts = ts + refill * refill_ms
+        end
+    end
+    if available >= capacity then
+        ts = now
+    end
+    if available < 1 then
+        retry_after = math.max(retry_after, refill_ms - (now - ts))
+    end
+    tokens[i] = available
+    stamps[i] = ts
+end
+
+local allowed = 0
+if retry_after == 0 then
+    allowed = 1
+end
+
+for i, key in ipairs(KEYS) do
+    redis.call("HSET", key, "tokens", tokens[i] - allowed, "ts", stamps[i])
+    redis.call("PEXPIRE", key, capacity * refill_ms)
+end
+
+return {allowed, retry_after}
+"""
+
+
 # =============================================================================
 # Verification Service
 # =============================================================================
@@ -169,7 +245,6 @@ class VerificationService:
     MAX_ATTEMPTS = 3
     MAX_REQUESTS_PER_HOUR = 5
     BLOCK_DURATION_MINUTES = 15
-    MIN_LOCAL_EMAIL_LENGTH = 2
 
     _initialized: bool = False
 
@@ -179,12 +254,26 @@ class VerificationService:
         keyspace: str,
         email_service: "EmailService",
         auth_service: "AuthService",
+        redis: "Redis | None" = None,
     ) -> None:
-        """Initialize verification service."""
+        """Initialize verification service.
+
+        Args:
+            session: Cassandra session
+            keyspace: Keyspace name
+            email_service: Service used to deliver codes
+            auth_service: Service used for user lookups and updates
+            redis: Optional Redis client for atomic rate limiting
+        """
         self.session = session
         self.keyspace = keyspace
         self.email_service = email_service
         self.auth_service = auth_service
+        self.redis = redis
+        # EVALSHA with automatic SCRIPT LOAD fallback on NOSCRIPT
+        self._rate_limit_script = (
+            redis.register_script(RATE_LIMIT_BUCKET_LUA) if redis is not None else None
+        )
         self._prepare_statements()
 
     async def initialize(self) -> None:
@@ -309,19 +398,52 @@ class VerificationService:
         computed_hash = hashlib.sha256(plain_code.encode()).hexdigest()
         return secrets.compare_digest(computed_hash, code_hash)
 
-    def _mask_email(self, email: str) -> str:
-        """Mask email for display."""
-        local, domain = email.split("@")
-        if len(local) <= self.MIN_LOCAL_EMAIL_LENGTH:
-            masked_local = local[0] + "*"
-        else:
-            masked_local = local[0] + "***"
-        return f"{masked_local}@{domain}"
-
     # =========================================================================
     # Rate Limiting
     # =========================================================================
 
+    async def _consume_rate_limit(self, email: str, ip: str | None) -> None:
+        """Check and consume rate limits for email and IP.
+
+        Uses the Redis token bucket when available, falling back to the
+        Cassandra counters if Redis is not configured or unreachable.
+        """
+        if self._rate_limit_script is not None:
+            try:
+                await self._consume_redis_rate_limit(email, ip)
+            except RedisError as e:
+                logger.warning("rate_limit_redis_unavailable", error=str(e))
+            else:
+                return
+
+        await self._check_rate_limit(email, ip)
+        await self._increment_rate_limit(email, ip)
+
+    async def _consume_redis_rate_limit(self, email: str, ip: str | None) -> None:
+        """Take one token from the email and IP buckets atomically."""
+        email_digest = hashlib.blake2b(
+            email.lower().encode(), digest_size=16
+        ).hexdigest()
+        keys = [f"verification_rate:email:{email_digest}"]
+        if ip:
+            keys.append(f"verification_rate:ip:{ip}")
+
+        refill_ms = 3_600_000 // self.MAX_REQUESTS_PER_HOUR
+        allowed, retry_after_ms = await self._rate_limit_script(
+            keys=keys,
+            args=[self.MAX_REQUESTS_PER_HOUR, refill_ms, int(time.time() * 1000)],
+        )
+
+        if not allowed:
+            remaining = int(retry_after_ms) // 60_000 + 1
+            logger.warning(
+                "rate_limit_exceeded",
+                email=mask_email(email),
+                retry_after_ms=int(retry_after_ms),
+            )
+            msg = f"Too many attempts. Try again in {remaining} minutes."
+            raise RateLimitExceededError(msg)
+
     async def _check_rate_limit(self, email: str, ip: str | None) -> None:
         """Check rate limits for email and IP."""
         keys_to_check = [f"email:{email}"]
@@ -430,22 +552,55 @@ class VerificationService:
         user_agent: str | None = None,
     ) -> bool:
         """Request a password reset code."""
-        logger.info("password_reset_requested", email=self._mask_email(email))
+        await self.check_password_reset_rate_limit(email, ip)
+        await self.send_password_reset_code(email, ip, user_agent)
+        return True
 
-        # Check rate limit
-        await self._check_rate_limit(email, ip)
+    async def check_password_reset_rate_limit(
+        self, email: str, ip: str | None = None
+    ) -> None:
+        """Record a password reset request against the rate limit.
 
-        # Increment rate limit
-        await self._increment_rate_limit(email, ip)
+        Raises:
+            RateLimitExceededError: If the email or IP is over the limit
+        """
+        logger.info("password_reset_requested", email=mask_email(email))
+        await self._consume_rate_limit(email, ip)
+
+    async def send_password_reset_code(
+        self,
+        email: str,
+        ip: str | None = None,
+        user_agent: str | None = None,
+    ) -> None:
+        """Issue and email a reset code if the account exists.
+
+        Safe to run as a background task: failures are logged, never raised.
+        Existence of the email is never revealed to the caller.
+        """
+        try:
+            await self._send_password_reset_code(email, ip, user_agent)
+        except Exception as e:
+            logger.exception(
+                "password_reset_delivery_failed",
+                email=mask_email(email),
+                error=str(e),
+            )
 
-        # Check if user exists (but don't reveal this to caller)
+    async def _send_password_reset_code(
+        self,
+        email: str,
+        ip: str | None,
+        user_agent: str | None,
+    ) -> None:
+        """Store a new reset code and send it to the user."""
         user = await self.auth_service.get_user_by_email(email)
         if not user:
             logger.info(
                 "password_reset_email_not_found",
-                email=self._mask_email(email),
+                email=mask_email(email),
             )
-            return True
+            return
 
         # Invalidate existing codes
         await self._invalidate_existing_codes(email, CodeType.PASSWORD_RESET)
@@ -502,18 +657,16 @@ class VerificationService:
             )
             logger.info(
                 "password_reset_code_sent",
-                email=self._mask_email(email),
+                email=mask_email(email),
                 code_id=str(code_id),
             )
         except Exception as e:
             logger.error(
                 "password_reset_email_failed",
-                email=self._mask_email(email),
+                email=mask_email(email),
                 error=str(e),
             )
 
-        return True
-
     async def verify_reset_code(self, email: str, code: str) -> bool:
         """Verify a password reset code without using it."""
         result = await self.session.aexecute(
@@ -541,7 +694,7 @@ class VerificationService:
             if self._verify_code_hash(code, row.code_hash):
                 logger.info(
                     "password_reset_code_verified",
-                    email=self._mask_email(email),
+                    email=mask_email(email),
                     code_id=str(row.id),
                 )
                 return True
@@ -596,13 +749,13 @@ class VerificationService:
                 except Exception as e:
                     logger.error(
                         "password_changed_notification_failed",
-                        email=self._mask_email(email),
+                        email=mask_email(email),
                         error=str(e),
                     )
 
                 logger.info(
                     "password_reset_completed",
-                    email=self._mask_email(email),
+                    email=mask_email(email),
                     user_id=str(user.id),
                 )
                 return True
@@ -628,7 +781,9 @@ class VerificationService:
             raise VerificationError("User not found.")
 
         # Verify current password
-        if not self.auth_service.verify_password(password, user.password_hash):
+        if not await self.auth_service.verify_password_async(
+            password, user.password_hash
+        ):
             logger.warning(
                 "email_change_wrong_password",
                 user_id=str(user_id),
@@ -640,9 +795,8 @@ class VerificationService:
         if existing_user:
             raise EmailNotAvailableError("This email is already in use.")
 
-        # Check rate limit
-        await self._check_rate_limit(user.email, ip)
-        await self._increment_rate_limit(user.email, ip)
+        # Check and consume rate limit
+        await self._consume_rate_limit(user.email, ip)
 
         # Invalidate existing codes
         await self._invalidate_existing_codes(user.email, CodeType.EMAIL_CHANGE)
@@ -700,7 +854,7 @@ class VerificationService:
             logger.info(
                 "email_change_code_sent",
                 user_id=str(user_id),
-                new_email=self._mask_email(new_email),
+                new_email=mask_email(new_email),
             )
         except Exception as e:
             logger.error(
@@ -777,8 +931,8 @@ class VerificationService:
                 logger.info(
                     "email_change_completed",
                     user_id=str(user_id),
-                    old_email=self._mask_email(user.email),
-                    new_email=self._mask_email(new_email),
+                    old_email=mask_email(user.email),
+                    new_email=mask_email(new_email),
                 )
 
                 return new_email
@@ -806,6 +960,6 @@ class VerificationService:
 
         logger.debug(
             "existing_codes_invalidated",
-            email=self._mask_email(email),
+            email=mask_email(email),
             code_type=code_type.value,
         )
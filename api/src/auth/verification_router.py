@@ -8,20 +8,31 @@ Endpoints:
 - POST /v1/auth/email/confirm-change - Confirm email change (authenticated)
 """
 
-from collections.abc import Callable
-from typing import Annotated
-
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from types import MappingProxyType
+from typing import Annotated, Any
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import ORJSONResponse
 
 from src.auth.dependencies import get_current_user
 from src.auth.models import User
 from src.auth.verification import (
+    CodeExpiredError,
     EmailNotAvailableError,
     InvalidCodeError,
     MaxAttemptsExceededError,
     RateLimitExceededError,
     VerificationError,
     VerificationService,
+    mask_email,
 )
 from src.auth.verification_schemas import (
     ConfirmEmailChangeRequest,
@@ -35,34 +46,99 @@ from src.auth.verification_schemas import (
     VerifyCodeRequest,
     VerifyCodeResponse,
 )
+from src.core.client_ip import get_client_info
 from src.core.logging import get_logger
 
 
 logger = get_logger(__name__)
 
-# Constants
-MIN_LOCAL_EMAIL_LENGTH = 2
+
+def _client_meta(request: Request) -> tuple[str | None, str | None]:
+    """Get the user agent and the socket peer IP for rate limiting.
+
+    The IP deliberately ignores X-Forwarded-For and X-Real-IP: they are
+    client-controlled and would let callers pick their own rate limit
+    bucket. The user agent comes from the memoized header scan.
+    """
+    user_agent = get_client_info(request)[0]
+    return user_agent, request.client.host if request.client else None
+
 
 router = APIRouter(prefix="/v1/auth", tags=["verification"])
 
-# Module-level getter for dependency injection
-_verification_service_getter: Callable[[], VerificationService] | None = None
+# Static response bodies, serialized once. A fresh Response is still built per
+# request because FastAPI attaches background tasks and headers to it.
+_FORGOT_PASSWORD_BODY = ForgotPasswordResponse().model_dump_json().encode()
+_INVALID_CODE_BODY = (
+    VerifyCodeResponse(valid=False, message="Invalid or expired code")
+    .model_dump_json()
+    .encode()
+)
+_PASSWORD_RESET_BODY = (
+    ResetPasswordResponse(success=True, message="Password reset successfully")
+    .model_dump_json()
+    .encode()
+)
+
 
+def _json_response(body: dict[str, Any] | bytes) -> Response:
+    """Build a JSON response from a plain dict or pre-encoded bytes.
+
+    These bodies are produced by the server, so they skip pydantic entirely:
+    no model is instantiated and, because a Response is returned, FastAPI
+    does not validate against ``response_model`` either. The response models
+    stay on the routes to document the shape in the OpenAPI schema.
+    """
+    if isinstance(body, bytes):
+        return Response(content=body, media_type="application/json")
+    return ORJSONResponse(content=body)
 
-def set_verification_service_getter(getter: Callable[[], VerificationService]) -> None:
-    """Set the verification service getter for dependency injection."""
-    global _verification_service_getter  # noqa: PLW0603
-    _verification_service_getter = getter
 
+async def get_verification_service(request: Request) -> VerificationService:
+    """Get the verification service from app state.
 
-def get_verification_service() -> VerificationService:
-    """Get the verification service instance."""
-    if _verification_service_getter is None:
+    Declared async so FastAPI resolves it inline on the event loop instead
+    of dispatching a plain function to the threadpool on every request.
+    The service is only set when email delivery is configured.
+    """
+    verification_service = getattr(request.app.state, "verification_service", None)
+    if verification_service is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Verification service not available",
         )
-    return _verification_service_getter()
+    return verification_service
+
+
+VerificationServiceDep = Annotated[
+    VerificationService, Depends(get_verification_service)
+]
+
+
+# =============================================================================
+# Error Handling
+# =============================================================================
+
+# Keyed by exact exception type; anything else (base VerificationError) is 400
+_VERIFICATION_ERROR_STATUS = MappingProxyType(
+    {
+        InvalidCodeError: status.HTTP_400_BAD_REQUEST,
+        CodeExpiredError: status.HTTP_400_BAD_REQUEST,
+        EmailNotAvailableError: status.HTTP_409_CONFLICT,
+        MaxAttemptsExceededError: status.HTTP_429_TOO_MANY_REQUESTS,
+        RateLimitExceededError: status.HTTP_429_TOO_MANY_REQUESTS,
+    }
+)
+
+
+def handle_verification_error(error: VerificationError) -> HTTPException:
+    """Convert VerificationError to HTTPException."""
+    return HTTPException(
+        status_code=_VERIFICATION_ERROR_STATUS.get(
+            type(error), status.HTTP_400_BAD_REQUEST
+        ),
+        detail=str(error),
+    )
 
 
 # =============================================================================
@@ -79,30 +155,33 @@ def get_verification_service() -> VerificationService:
 async def forgot_password(
     request: Request,
     body: ForgotPasswordRequest,
-    verification_service: Annotated[
-        VerificationService, Depends(get_verification_service)
-    ],
-) -> ForgotPasswordResponse:
+    background_tasks: BackgroundTasks,
+    verification_service: VerificationServiceDep,
+) -> Response:
     """Request a password reset code.
 
-    Always returns success to avoid revealing if email exists.
+    Always returns success to avoid revealing if email exists. Only the
+    rate limit is checked inline; the user lookup and email delivery run
+    after the response is sent, so timing does not depend on the email.
     """
-    ip = request.client.host if request.client else None
-    user_agent = request.headers.get("user-agent")
+    user_agent, ip = _client_meta(request)
 
     try:
-        await verification_service.request_password_reset(
+        await verification_service.check_password_reset_rate_limit(
             email=body.email,
             ip=ip,
-            user_agent=user_agent,
         )
-    except RateLimitExceededError as e:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(e),
-        ) from e
+    except VerificationError as e:
+        raise handle_verification_error(e) from e
+
+    background_tasks.add_task(
+        verification_service.send_password_reset_code,
+        email=body.email,
+        ip=ip,
+        user_agent=user_agent,
+    )
 
-    return ForgotPasswordResponse()
+    return _json_response(_FORGOT_PASSWORD_BODY)
 
 
 @router.post(
@@ -113,24 +192,19 @@ async def forgot_password(
 )
 async def verify_password_reset_code(
     body: VerifyCodeRequest,
-    verification_service: Annotated[
-        VerificationService, Depends(get_verification_service)
-    ],
-) -> VerifyCodeResponse:
+    verification_service: VerificationServiceDep,
+) -> Response:
     """Verify a password reset code."""
     try:
         valid = await verification_service.verify_reset_code(
             email=body.email,
             code=body.code,
         )
-        return VerifyCodeResponse(valid=valid, message="Code is valid")
+        return _json_response({"valid": valid, "message": "Code is valid"})
     except InvalidCodeError:
-        return VerifyCodeResponse(valid=False, message="Invalid or expired code")
-    except MaxAttemptsExceededError as e:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(e),
-        ) from e
+        return _json_response(_INVALID_CODE_BODY)
+    except VerificationError as e:
+        raise handle_verification_error(e) from e
 
 
 @router.post(
@@ -141,10 +215,8 @@ async def verify_password_reset_code(
 )
 async def reset_password(
     body: ResetPasswordRequest,
-    verification_service: Annotated[
-        VerificationService, Depends(get_verification_service)
-    ],
-) -> ResetPasswordResponse:
+    verification_service: VerificationServiceDep,
+) -> Response:
     """Reset password using verification code."""
     try:
         await verification_service.reset_password(
@@ -152,20 +224,9 @@ async def reset_password(
             code=body.code,
             new_password=body.new_password,
         )
-        return ResetPasswordResponse(
-            success=True,
-            message="Password reset successfully",
-        )
-    except InvalidCodeError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        ) from e
-    except MaxAttemptsExceededError as e:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(e),
-        ) from e
+        return _json_response(_PASSWORD_RESET_BODY)
+    except VerificationError as e:
+        raise handle_verification_error(e) from e
 
 
 # =============================================================================
@@ -183,13 +244,10 @@ async def request_email_change(
     request: Request,
     body: RequestEmailChangeRequest,
     current_user: Annotated[User, Depends(get_current_user)],
-    verification_service: Annotated[
-        VerificationService, Depends(get_verification_service)
-    ],
-) -> RequestEmailChangeResponse:
+    verification_service: VerificationServiceDep,
+) -> Response:
     """Request email change (requires current password)."""
-    ip = request.client.host if request.client else None
-    user_agent = request.headers.get("user-agent")
+    user_agent, ip = _client_meta(request)
 
     try:
         await verification_service.request_email_change(
@@ -200,33 +258,14 @@ async def request_email_change(
             user_agent=user_agent,
         )
 
-        # Mask email for response
-        local, domain = body.new_email.split("@")
-        masked = (
-            f"{local[0]}***@{domain}"
-            if len(local) > MIN_LOCAL_EMAIL_LENGTH
-            else f"{local[0]}*@{domain}"
-        )
-
-        return RequestEmailChangeResponse(
-            message="Verification code sent to new email",
-            email_masked=masked,
+        return _json_response(
+            {
+                "message": "Verification code sent to new email",
+                "email_masked": mask_email(body.new_email),
+            }
         )
     except VerificationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        ) from e
-    except EmailNotAvailableError as e:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=str(e),
-        ) from e
-    except RateLimitExceededError as e:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(e),
-        ) from e
+        raise handle_verification_error(e) from e
 
 
 @router.post(
@@ -238,38 +277,20 @@ async def request_email_change(
 async def confirm_email_change(
     body: ConfirmEmailChangeRequest,
     current_user: Annotated[User, Depends(get_current_user)],
-    verification_service: Annotated[
-        VerificationService, Depends(get_verification_service)
-    ],
-) -> ConfirmEmailChangeResponse:
+    verification_service: VerificationServiceDep,
+) -> Response:
     """Confirm email change with verification code."""
     try:
         new_email = await verification_service.confirm_email_change(
             user_id=current_user.id,
             code=body.code,
         )
-        return ConfirmEmailChangeResponse(
-            success=True,
-            message="Email changed successfully",
-            new_email=new_email,
+        return _json_response(
+            {
+                "success": True,
+                "message": "Email changed successfully",
+                "new_email": new_email,
+            }
         )
-    except InvalidCodeError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        ) from e
-    except MaxAttemptsExceededError as e:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(e),
-        ) from e
-    except EmailNotAvailableError as e:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=str(e),
-        ) from e
     except VerificationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        ) from e
+        raise handle_verification_error(e) from e
@@ -1,10 +1,33 @@
 """Verification schemas for password reset and email change."""
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator
 
 from src.auth.validators import validate_password
 
 
+# Shared constraint for every request carrying a verification code
+VerificationCodeStr = Annotated[
+    str, StringConstraints(min_length=6, max_length=6, pattern=r"^\d{6}$")
+]
+
+# Syntactic email check for the verification endpoints. Lowercased to match
+# how accounts are stored, so codes and rate limits key on one spelling.
+EmailAddress = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        to_lower=True,
+        max_length=254,
+        pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$",
+    ),
+]
+
+# Responses are built server-side and never mutated. Building their validators
+# is deferred until first use instead of at import.
+_RESPONSE_CONFIG = ConfigDict(frozen=True, defer_build=True)
+
 # ==============================================================================
 # Password Reset Schemas
 # ==============================================================================
@@ -13,7 +36,7 @@ from src.auth.validators import validate_password
 class ForgotPasswordRequest(BaseModel):
     """Request to initiate password reset."""
 
-    email: EmailStr = Field(..., description="Email address to send reset code")
+    email: EmailAddress = Field(..., description="Email address to send reset code")
 
 
 class ForgotPasswordResponse(BaseModel):
@@ -22,6 +45,8 @@ class ForgotPasswordResponse(BaseModel):
     Always returns success message to not reveal if email exists.
     """
 
+    model_config = _RESPONSE_CONFIG
+
     message: str = Field(
         default="Se o email existir, um codigo sera enviado",
         description="Generic success message",
@@ -31,34 +56,22 @@ class ForgotPasswordResponse(BaseModel):
 class VerifyCodeRequest(BaseModel):
     """Request to verify a reset code."""
 
-    email: EmailStr = Field(..., description="Email address")
-    code: str = Field(
-        ...,
-        min_length=6,
-        max_length=6,
-        pattern=r"^\d{6}$",
-        description="6-digit verification code",
-    )
+    email: EmailAddress = Field(..., description="Email address")
+    code: VerificationCodeStr = Field(..., description="6-digit verification code")
 
 
 class VerifyCodeResponse(BaseModel):
     """Response for code verification."""
 
+    model_config = _RESPONSE_CONFIG
+
     valid: bool = Field(..., description="Whether code is valid")
     message: str = Field(..., description="Status message")
 
 
-class ResetPasswordRequest(BaseModel):
+class ResetPasswordRequest(VerifyCodeRequest):
     """Request to reset password with verification code."""
 
-    email: EmailStr = Field(..., description="Email address")
-    code: str = Field(
-        ...,
-        min_length=6,
-        max_length=6,
-        pattern=r"^\d{6}$",
-        description="6-digit verification code",
-    )
     new_password: str = Field(
         ...,
         min_length=8,
@@ -79,6 +92,8 @@ class ResetPasswordRequest(BaseModel):
 class ResetPasswordResponse(BaseModel):
     """Response for password reset."""
 
+    model_config = _RESPONSE_CONFIG
+
     success: bool = Field(..., description="Whether reset was successful")
     message: str = Field(..., description="Status message")
 
@@ -91,13 +106,15 @@ class ResetPasswordResponse(BaseModel):
 class RequestEmailChangeRequest(BaseModel):
     """Request to initiate email change."""
 
-    new_email: EmailStr = Field(..., description="New email address")
+    new_email: EmailAddress = Field(..., description="New email address")
     password: str = Field(..., description="Current password for verification")
 
 
 class RequestEmailChangeResponse(BaseModel):
     """Response for email change request."""
 
+    model_config = _RESPONSE_CONFIG
+
     message: str = Field(..., description="Status message")
     email_masked: str = Field(
         ..., description="Masked version of new email for display"
@@ -107,18 +124,14 @@ class RequestEmailChangeResponse(BaseModel):
 class ConfirmEmailChangeRequest(BaseModel):
     """Request to confirm email change with code."""
 
-    code: str = Field(
-        ...,
-        min_length=6,
-        max_length=6,
-        pattern=r"^\d{6}$",
-        description="6-digit verification code",
-    )
+    code: VerificationCodeStr = Field(..., description="6-digit verification code")
 
 
 class ConfirmEmailChangeResponse(BaseModel):
     """Response for email change confirmation."""
 
+    model_config = _RESPONSE_CONFIG
+
     success: bool = Field(..., description="Whether change was successful")
     message: str = Field(..., description="Status message")
     new_email: str | None = Field(None, description="New email if successful")
@@ -132,6 +145,8 @@ class ConfirmEmailChangeResponse(BaseModel):
 class RateLimitResponse(BaseModel):
     """Response when rate limit is exceeded."""
 
+    model_config = _RESPONSE_CONFIG
+
     error: bool = Field(default=True)
     message: str = Field(..., description="Rate limit error message")
     retry_after_seconds: int = Field(..., description="Seconds to wait before retrying")
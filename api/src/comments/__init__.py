@@ -13,6 +13,7 @@ Import directly from src.comments.router when needed.
 from .models import (
     COMMENTS_TABLES_CQL,
     Comment,
+    CommentEdit,
     CommentReply,
     CommentReport,
     ReactionCounts,
@@ -26,6 +27,7 @@ from .service import CommentService
 __all__ = [
     "COMMENTS_TABLES_CQL",
     "Comment",
+    "CommentEdit",
     "CommentReply",
     "CommentReport",
     "CommentService",
@@ -8,6 +8,8 @@ Provides dependency injection for:
 - Permission checks
 """
 
+from functools import cache
+from types import MappingProxyType
 from typing import Annotated, Any
 
 from fastapi import Depends, HTTPException, Request, status
@@ -51,17 +53,25 @@ async def get_notification_service(request: Request) -> NotificationService | No
     return None
 
 
+@cache
+def _main_app_state() -> Any:
+    """Resolve main.py's app_state once and reuse it.
+
+    Imported lazily to avoid a circular import at module load time; the
+    cache keeps the import machinery off the per-request path.
+    """
+    from src.main import app_state  # noqa: PLC0415
+
+    return app_state
+
+
 async def get_auth_service_for_comments(_request: Request) -> AuthService | None:
     """Get auth service from main app state for user lookups.
 
     Returns None if not available.
     """
     # Auth service is set via the getter pattern in main.py
-    # We need to access it from the app_state
-    # Note: Import here to avoid circular imports at module load time
-    from src.main import app_state as main_app_state  # noqa: PLC0415
-
-    return main_app_state.auth_service
+    return _main_app_state().auth_service
 
 
 # Type aliases for dependency injection
@@ -71,6 +81,28 @@ NotificationServiceDep = Annotated[
 ]
 AuthServiceDep = Annotated[AuthService | None, Depends(get_auth_service_for_comments)]
 
+# CommentError.code -> HTTP status; unknown codes map to 500
+_COMMENT_ERROR_STATUS = MappingProxyType(
+    {
+        "comment_not_found": status.HTTP_404_NOT_FOUND,
+        "permission_denied": status.HTTP_403_FORBIDDEN,
+        "rate_limit_exceeded": status.HTTP_429_TOO_MANY_REQUESTS,
+        "spam_detected": status.HTTP_400_BAD_REQUEST,
+        "edit_window_expired": status.HTTP_400_BAD_REQUEST,
+        "invalid_cursor": status.HTTP_400_BAD_REQUEST,
+    }
+)
+
+# Roles with moderator permissions, as enum members and raw token strings
+_MODERATOR_ROLES = frozenset(
+    {
+        UserRole.ADMIN,
+        UserRole.TEACHER,
+        UserRole.ADMIN.value,
+        UserRole.TEACHER.value,
+    }
+)
+
 
 def handle_comment_error(error: CommentError) -> HTTPException:
     """Convert comment errors to HTTP exceptions.
@@ -81,18 +113,10 @@ def handle_comment_error(error: CommentError) -> HTTPException:
     Returns:
         HTTPException with appropriate status code
     """
-    status_map = {
-        "comment_not_found": status.HTTP_404_NOT_FOUND,
-        "permission_denied": status.HTTP_403_FORBIDDEN,
-        "rate_limit_exceeded": status.HTTP_429_TOO_MANY_REQUESTS,
-        "spam_detected": status.HTTP_400_BAD_REQUEST,
-        "edit_window_expired": status.HTTP_400_BAD_REQUEST,
-    }
-
-    status_code = status_map.get(error.code, status.HTTP_500_INTERNAL_SERVER_ERROR)
-
     return HTTPException(
-        status_code=status_code,
+        status_code=_COMMENT_ERROR_STATUS.get(
+            error.code, status.HTTP_500_INTERNAL_SERVER_ERROR
+        ),
         detail=error.message,
     )
 
@@ -108,5 +132,18 @@ def is_moderator(user: Any) -> bool:
     Returns:
         True if user is moderator
     """
-    user_role = UserRole(user.role) if isinstance(user.role, str) else user.role
-    return user_role in (UserRole.ADMIN, UserRole.TEACHER)
+    return user.role in _MODERATOR_ROLES
+
+
+def display_name(user: Any) -> str:
+    """Get the name shown for a user on comments and notifications.
+
+    Falls back to the local part of the email when the user has no name.
+
+    Args:
+        user: User from token
+
+    Returns:
+        Display name
+    """
+    return user.name or user.email.partition("@")[0]
@@ -11,13 +11,68 @@ Architecture: Adjacency List pattern for hierarchical comments
 - Soft delete with edit history tracking
 """
 
-from dataclasses import dataclass, field
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields
 from datetime import UTC, datetime, timedelta
 from enum import Enum
-from typing import Any
+from functools import partial
+from typing import Any, get_args
 from uuid import UUID, uuid4
 
 
+# Bound once so factories skip the datetime.now attribute lookup per call
+_utcnow = partial(datetime.now, UTC)
+
+DEFAULT_AUTHOR_NAME = "Usuario"
+
+
+def _intern_optional(value: str | None) -> str | None:
+    """Intern a repeated string column (author names, avatar URLs).
+
+    The driver builds a new string per row, so a thread where one author
+    posts many replies would otherwise hold many equal copies.
+    """
+    return sys.intern(value) if value else value
+
+
+def _converter_for(field_type: Any) -> Callable[[Any], Any] | None:
+    """Pick the to_dict converter for a field type (None keeps the value)."""
+    types = get_args(field_type) or (field_type,)
+    if UUID in types:
+        return str
+    if datetime in types:
+        return datetime.isoformat
+    if any(isinstance(t, type) and issubclass(t, Enum) for t in types):
+        return lambda member: member.value
+    return None
+
+
+# Per-class (field name, converter) pairs, built on first to_dict call
+_FIELD_CACHE: dict[type, tuple[tuple[str, Callable[[Any], Any] | None], ...]] = {}
+
+
+def _to_dict(obj: Any) -> dict[str, Any]:
+    """Convert an entity dataclass to a JSON-friendly dictionary.
+
+    UUIDs become strings, datetimes ISO strings and enums their values;
+    None stays None. Fields starting with an underscore are skipped.
+    """
+    cls = type(obj)
+    converters = _FIELD_CACHE.get(cls)
+    if converters is None:
+        converters = _FIELD_CACHE[cls] = tuple(
+            (f.name, _converter_for(f.type))
+            for f in fields(cls)
+            if not f.name.startswith("_")
+        )
+    result = {}
+    for name, convert in converters:
+        value = getattr(obj, name)
+        result[name] = convert(value) if convert and value is not None else value
+    return result
+
+
 class ReactionType(str, Enum):
     """Available reaction types for comments."""
 
@@ -73,7 +128,6 @@ CREATE TABLE IF NOT EXISTS {keyspace}.comments (
     author_name TEXT,
     author_avatar TEXT,
     content TEXT,
-    content_history LIST<FROZEN<MAP<TEXT, TEXT>>>,
     is_edited BOOLEAN,
     edited_at TIMESTAMP,
     is_deleted BOOLEAN,
@@ -89,17 +143,12 @@ CREATE TABLE IF NOT EXISTS {keyspace}.comments (
 ) WITH CLUSTERING ORDER BY (created_at DESC, comment_id ASC)
 """
 
-# Index for fetching comments by parent (for threaded replies)
-COMMENT_PARENT_INDEX_CQL = """
-CREATE INDEX IF NOT EXISTS comments_parent_idx
-ON {keyspace}.comments (parent_id)
+# Migration: replies are read from comments_by_parent, so the secondary index
+# on comments.parent_id only cost an extra index write per insert
+COMMENT_DROP_PARENT_INDEX_CQL = """
+DROP INDEX IF EXISTS {keyspace}.comments_parent_idx
 """
 
-# Index for fetching comments by author
-COMMENT_AUTHOR_INDEX_CQL = """
-CREATE INDEX IF NOT EXISTS comments_author_idx
-ON {keyspace}.comments (author_id)
-"""
 
 # Comments by ID - O(1) lookup table
 # Allows efficient single comment fetch without full scan
@@ -144,6 +193,41 @@ CREATE TABLE IF NOT EXISTS {keyspace}.comments_by_parent (
 ) WITH CLUSTERING ORDER BY (created_at ASC, comment_id ASC)
 """
 
+# Comments by author - single-partition reads per user
+# Replaces the secondary index on comments.author_id (see migration 002)
+COMMENTS_BY_AUTHOR_TABLE_CQL = """
+CREATE TABLE IF NOT EXISTS {keyspace}.comments_by_author (
+    author_id UUID,
+    created_at TIMESTAMP,
+    comment_id UUID,
+    lesson_id UUID,
+    parent_id UUID,
+    author_name TEXT,
+    author_avatar TEXT,
+    content TEXT,
+    is_edited BOOLEAN,
+    is_deleted BOOLEAN,
+    reply_count INT,
+    rating TINYINT,
+    is_review BOOLEAN,
+    PRIMARY KEY ((author_id), created_at, comment_id)
+) WITH CLUSTERING ORDER BY (created_at DESC, comment_id ASC)
+"""
+
+# Edit history - previous versions of a comment, newest first
+# Kept out of the comments row so reads never decode the history and an edit
+# appends one row instead of rewriting a frozen collection. Older deployments
+# still have the legacy comments.content_history column; it is no longer read
+# once migration 006 has copied its entries into this table.
+COMMENT_CONTENT_HISTORY_TABLE_CQL = """
+CREATE TABLE IF NOT EXISTS {keyspace}.comment_content_history (
+    comment_id UUID,
+    edited_at TIMESTAMP,
+    previous_content TEXT,
+    PRIMARY KEY ((comment_id), edited_at)
+) WITH CLUSTERING ORDER BY (edited_at DESC)
+"""
+
 # Reactions Table
 # Partition by comment_id for efficient reaction queries
 REACTION_TABLE_CQL = """
@@ -168,15 +252,32 @@ CREATE TABLE IF NOT EXISTS {keyspace}.user_comment_reactions (
 """
 
 # Reaction counts - denormalized for fast reads
+# Each (reaction_type, shard) row is its own counter cell, so concurrent
+# reactions on a hot comment spread over REACTION_COUNT_SHARDS cells instead
+# of contending on one. Readers sum the shards of the single partition.
+# Replaces the unsharded comment_reaction_counts table (see migration 004).
+REACTION_COUNT_SHARDS = 16
+
 REACTION_COUNTS_TABLE_CQL = """
-CREATE TABLE IF NOT EXISTS {keyspace}.comment_reaction_counts (
+CREATE TABLE IF NOT EXISTS {keyspace}.comment_reaction_count_shards (
     comment_id UUID,
     reaction_type TEXT,
+    shard TINYINT,
     count COUNTER,
-    PRIMARY KEY ((comment_id), reaction_type)
+    PRIMARY KEY ((comment_id), reaction_type, shard)
 )
 """
 
+
+def reaction_count_shard(user_id: UUID) -> int:
+    """Pick the counter shard for a user's reaction writes.
+
+    The low bits of the user UUID are random, so no extra RNG is needed,
+    and a user's add and remove always hit the same shard.
+    """
+    return user_id.int % REACTION_COUNT_SHARDS
+
+
 # Reports Table
 REPORT_TABLE_CQL = """
 CREATE TABLE IF NOT EXISTS {keyspace}.comment_reports (
@@ -238,6 +339,8 @@ CREATE TABLE IF NOT EXISTS {keyspace}.comment_blocks_by_moderator (
 """
 
 # Moderator Action Audit Log - complete audit trail
+# Append-only and TTL'd: 14-day time windows (~26 over the TTL) let expired
+# SSTables be dropped whole instead of being rewritten by compaction
 MODERATOR_AUDIT_LOG_TABLE_CQL = """
 CREATE TABLE IF NOT EXISTS {keyspace}.moderator_audit_log (
     log_id UUID,
@@ -252,16 +355,19 @@ CREATE TABLE IF NOT EXISTS {keyspace}.moderator_audit_log (
     PRIMARY KEY ((moderator_id), performed_at, log_id)
 ) WITH CLUSTERING ORDER BY (performed_at DESC, log_id ASC)
   AND default_time_to_live = 31536000
+  AND compaction = {{'class': 'TimeWindowCompactionStrategy', 'compaction_window_unit': 'DAYS', 'compaction_window_size': 14}}
+  AND gc_grace_seconds = 86400
   AND comment = 'Audit log for moderator actions (1 year TTL for compliance)'
 """
 
 # All table definitions for initialization
 COMMENTS_TABLES_CQL = [
     COMMENT_TABLE_CQL,
-    COMMENT_PARENT_INDEX_CQL,
-    COMMENT_AUTHOR_INDEX_CQL,
+    COMMENT_DROP_PARENT_INDEX_CQL,
     COMMENTS_BY_ID_TABLE_CQL,
     COMMENTS_BY_PARENT_TABLE_CQL,
+    COMMENTS_BY_AUTHOR_TABLE_CQL,
+    COMMENT_CONTENT_HISTORY_TABLE_CQL,
     REACTION_TABLE_CQL,
     USER_REACTIONS_TABLE_CQL,
     REACTION_COUNTS_TABLE_CQL,
@@ -278,7 +384,7 @@ COMMENTS_TABLES_CQL = [
 # ==============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class Comment:
     """Comment entity with full details."""
 
@@ -289,7 +395,6 @@ class Comment:
     author_name: str
     author_avatar: str | None
     content: str
-    content_history: list[dict[str, str]]
     is_edited: bool
     edited_at: datetime | None
     is_deleted: bool
@@ -310,10 +415,9 @@ class Comment:
             lesson_id=row.lesson_id,
             parent_id=row.parent_id,
             author_id=row.author_id,
-            author_name=row.author_name or "Usuario",
-            author_avatar=row.author_avatar,
+            author_name=_intern_optional(row.author_name) or DEFAULT_AUTHOR_NAME,
+            author_avatar=_intern_optional(row.author_avatar),
             content=row.content,
-            content_history=row.content_history or [],
             is_edited=row.is_edited or False,
             edited_at=row.edited_at,
             is_deleted=row.is_deleted or False,
@@ -321,38 +425,18 @@ class Comment:
             deleted_by=row.deleted_by,
             delete_reason=row.delete_reason,
             reply_count=row.reply_count or 0,
-            rating=row.rating if hasattr(row, "rating") else None,
-            is_review=row.is_review if hasattr(row, "is_review") else False,
+            rating=row.rating,
+            is_review=row.is_review or False,
             created_at=row.created_at,
             updated_at=row.updated_at or row.created_at,
         )
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
-        return {
-            "comment_id": str(self.comment_id),
-            "lesson_id": str(self.lesson_id),
-            "parent_id": str(self.parent_id) if self.parent_id else None,
-            "author_id": str(self.author_id),
-            "author_name": self.author_name,
-            "author_avatar": self.author_avatar,
-            "content": self.content,
-            "content_history": self.content_history,
-            "is_edited": self.is_edited,
-            "edited_at": self.edited_at.isoformat() if self.edited_at else None,
-            "is_deleted": self.is_deleted,
-            "deleted_at": self.deleted_at.isoformat() if self.deleted_at else None,
-            "deleted_by": str(self.deleted_by) if self.deleted_by else None,
-            "delete_reason": self.delete_reason,
-            "reply_count": self.reply_count,
-            "rating": self.rating,
-            "is_review": self.is_review,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-        }
-
-
-@dataclass
+        return _to_dict(self)
+
+
+@dataclass(slots=True)
 class CommentReply:
     """Lightweight comment for reply lists."""
 
@@ -378,19 +462,19 @@ class CommentReply:
             lesson_id=row.lesson_id,
             parent_id=row.parent_id,
             author_id=row.author_id,
-            author_name=row.author_name or "Usuario",
-            author_avatar=row.author_avatar,
+            author_name=_intern_optional(row.author_name) or DEFAULT_AUTHOR_NAME,
+            author_avatar=_intern_optional(row.author_avatar),
             content=row.content,
             is_edited=row.is_edited or False,
             is_deleted=row.is_deleted or False,
             reply_count=row.reply_count or 0,
-            rating=row.rating if hasattr(row, "rating") else None,
-            is_review=row.is_review if hasattr(row, "is_review") else False,
+            rating=row.rating,
+            is_review=row.is_review or False,
             created_at=row.created_at,
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CommentLookup:
     """Lightweight comment for O(1) ID lookup."""
 
@@ -418,21 +502,39 @@ class CommentLookup:
             lesson_id=row.lesson_id,
             parent_id=row.parent_id,
             author_id=row.author_id,
-            author_name=row.author_name or "Usuario",
-            author_avatar=row.author_avatar,
+            author_name=_intern_optional(row.author_name) or DEFAULT_AUTHOR_NAME,
+            author_avatar=_intern_optional(row.author_avatar),
             content=row.content,
             is_edited=row.is_edited or False,
             edited_at=row.edited_at,
             is_deleted=row.is_deleted or False,
             reply_count=row.reply_count or 0,
-            rating=row.rating if hasattr(row, "rating") else None,
-            is_review=row.is_review if hasattr(row, "is_review") else False,
+            rating=row.rating,
+            is_review=row.is_review or False,
             created_at=row.created_at,
             updated_at=row.updated_at or row.created_at,
         )
 
 
-@dataclass
+@dataclass(slots=True)
+class CommentEdit:
+    """Previous version of an edited comment."""
+
+    comment_id: UUID
+    edited_at: datetime
+    previous_content: str
+
+    @classmethod
+    def from_row(cls, row: Any) -> "CommentEdit":
+        """Create CommentEdit from Cassandra row."""
+        return cls(
+            comment_id=row.comment_id,
+            edited_at=row.edited_at,
+            previous_content=row.previous_content,
+        )
+
+
+@dataclass(slots=True)
 class Reaction:
     """User reaction to a comment."""
 
@@ -452,19 +554,33 @@ class Reaction:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ReactionCounts:
     """Aggregated reaction counts for a comment."""
 
     comment_id: UUID
     counts: dict[str, int] = field(default_factory=dict)
+    _total: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compute the running total once; add() keeps it in sync."""
+        self._total = sum(self.counts.values())
+
+    def add(self, reaction_type: str, delta: int = 1) -> None:
+        """Adjust one reaction count and the running total.
+
+        Change counts through this method; editing ``counts`` directly
+        leaves total() stale.
+        """
+        self.counts[reaction_type] = self.counts.get(reaction_type, 0) + delta
+        self._total += delta
 
     def total(self) -> int:
         """Get total reaction count."""
-        return sum(self.counts.values())
+        return self._total
 
 
-@dataclass
+@dataclass(slots=True)
 class CommentReport:
     """Report of a comment for moderation."""
 
@@ -498,7 +614,7 @@ class CommentReport:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class UserCommentBlock:
     """User comment block entity."""
 
@@ -525,9 +641,13 @@ class UserCommentBlock:
             is_permanent=row.is_permanent if row.is_permanent is not None else True,
         )
 
-    def is_active(self) -> bool:
+    def is_active(self, now: datetime | None = None) -> bool:
         """Check if the block is currently active.
 
+        Args:
+            now: Current UTC time; pass it when checking many blocks so the
+                clock is read once
+
         Returns:
             True if block is active (permanent or not yet expired), False otherwise
         """
@@ -535,10 +655,10 @@ class UserCommentBlock:
             return True
         if self.expires_at is None:
             return False
-        return datetime.now(UTC) < self.expires_at
+        return (now or _utcnow()) < self.expires_at
 
 
-@dataclass
+@dataclass(slots=True)
 class ModeratorAuditLog:
     """Audit log entry for moderator actions."""
 
@@ -569,24 +689,7 @@ class ModeratorAuditLog:
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
-        return {
-            "block_id": str(self.block_id),
-            "user_id": str(self.user_id),
-            "blocked_at": self.blocked_at.isoformat(),
-            "blocked_by": str(self.blocked_by),
-            "reason": self.reason,
-            "moderator_notes": self.moderator_notes,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
-            "is_permanent": self.is_permanent,
-        }
-
-    def is_active(self) -> bool:
-        """Check if block is still active."""
-        if self.is_permanent:
-            return True
-        if self.expires_at is None:
-            return False
-        return datetime.now(UTC) < self.expires_at
+        return _to_dict(self)
 
 
 # ==============================================================================
@@ -603,9 +706,14 @@ def create_comment(
     author_avatar: str | None = None,
     rating: int | None = None,
     is_review: bool = False,
+    *,
+    now: datetime | None = None,
 ) -> Comment:
-    """Create a new comment with default values."""
-    now = datetime.now(UTC)
+    """Create a new comment with default values.
+
+    Pass ``now`` to share one timestamp across related writes.
+    """
+    now = now or _utcnow()
     return Comment(
         comment_id=uuid4(),
         lesson_id=lesson_id,
@@ -614,7 +722,6 @@ def create_comment(
         author_name=author_name,
         author_avatar=author_avatar,
         content=content,
-        content_history=[],
         is_edited=False,
         edited_at=None,
         is_deleted=False,
@@ -635,9 +742,14 @@ def create_report(
     reporter_id: UUID,
     reason: ReportReason,
     description: str | None = None,
+    *,
+    now: datetime | None = None,
 ) -> CommentReport:
-    """Create a new comment report."""
-    now = datetime.now(UTC)
+    """Create a new comment report.
+
+    Pass ``now`` to share one timestamp across related writes.
+    """
+    now = now or _utcnow()
     return CommentReport(
         report_id=uuid4(),
         comment_id=comment_id,
@@ -659,9 +771,14 @@ def create_user_block(
     reason: str,
     moderator_notes: str | None = None,
     duration_days: int | None = None,
+    *,
+    now: datetime | None = None,
 ) -> UserCommentBlock:
-    """Create a new user comment block."""
-    now = datetime.now(UTC)
+    """Create a new user comment block.
+
+    Pass ``now`` to share one timestamp across related writes.
+    """
+    now = now or _utcnow()
     is_permanent = duration_days is None
     expires_at = None if is_permanent else now + timedelta(days=duration_days)
 
@@ -685,6 +802,8 @@ def create_audit_log(
     details: str | None = None,
     ip_address: str | None = None,
     user_agent: str | None = None,
+    *,
+    now: datetime | None = None,
 ) -> ModeratorAuditLog:
     """Create a moderator audit log entry.
 
@@ -696,6 +815,8 @@ def create_audit_log(
         details: Additional details about the action (JSON string or text)
         ip_address: IP address of the moderator (for security audit)
         user_agent: User agent of the moderator (for security audit)
+        now: Timestamp to record (defaults to the current UTC time); pass
+            it to share one timestamp across related writes
 
     Returns:
         ModeratorAuditLog instance ready to be inserted
@@ -706,7 +827,7 @@ def create_audit_log(
         action=action,
         target_user_id=target_user_id,
         target_id=target_id,
-        performed_at=datetime.now(UTC),
+        performed_at=now or _utcnow(),
         details=details,
         ip_address=ip_address,
         user_agent=user_agent,
@@ -8,20 +8,25 @@ Provides routes for:
 - Notifications for @mentions and replies
 """
 
-import contextlib
+import asyncio
 from datetime import datetime
+from typing import Annotated
 from uuid import UUID
 
 import structlog
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, BackgroundTasks, Query, Response, status
+from pydantic import TypeAdapter
 
 from src.auth.dependencies import AdminUser, CurrentUser, OptionalUser
+from src.auth.service import AuthService
 from src.metrics import EventName, emit_business_event
+from src.notifications.service import NotificationService
 
 from .dependencies import (
     AuthServiceDep,
     CommentServiceDep,
     NotificationServiceDep,
+    display_name,
     handle_comment_error,
     is_moderator,
 )
@@ -45,6 +50,7 @@ from .schemas import (
 from .service import (
     CommentError,
     CommentNotFoundError,
+    CommentService,
 )
 
 
@@ -53,6 +59,88 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/v1/comments", tags=["comments"])
 
+# Query parameters shared by the routes that address a single comment
+LessonIdQuery = Annotated[UUID, Query(description="Lesson ID for comment lookup")]
+CreatedAtQuery = Annotated[datetime, Query(description="Comment creation timestamp")]
+
+_REPLIES_ADAPTER = TypeAdapter(list[CommentResponse])
+
+
+def _json_response(body: bytes | str) -> Response:
+    """Wrap an already serialized read response in a JSON response.
+
+    The read responses are built from our own entities and serialized once by
+    pydantic-core; returning a Response keeps FastAPI from validating and
+    encoding them again against ``response_model``, which stays on the
+    routes to document the shape in the OpenAPI schema.
+    """
+    return Response(content=body, media_type="application/json")
+
+
+async def _send_comment_notifications(
+    *,
+    data: CreateCommentRequest,
+    comment_id: UUID,
+    author_id: UUID,
+    author_name: str,
+    author_avatar: str | None,
+    comment_service: CommentService,
+    notification_service: NotificationService,
+    auth_service: AuthService,
+) -> None:
+    """Create @mention and reply notifications for a new comment.
+
+    Runs as a background task: failures are logged, never raised.
+    """
+
+    async def user_lookup(name: str):
+        """Lookup user by name for @mention resolution."""
+        return await auth_service.get_user_by_name(name)
+
+    async def notify_parent_author() -> None:
+        """Notify the parent comment author if this is a reply."""
+        if not data.parent_id:
+            return
+        parent_comment = await comment_service.find_comment_by_id(
+            data.lesson_id, data.parent_id
+        )
+        if parent_comment:
+            await notification_service.notify_reply(
+                comment_author_id=parent_comment.author_id,
+                replier_id=author_id,
+                replier_name=author_name,
+                reply_comment_id=comment_id,
+                parent_comment_id=data.parent_id,
+                lesson_id=data.lesson_id,
+                course_slug=data.course_slug,
+                lesson_slug=data.lesson_slug,
+                reply_content=data.content,
+                replier_avatar=author_avatar,
+            )
+
+    results = await asyncio.gather(
+        notification_service.process_mentions(
+            content=data.content,
+            author_id=author_id,
+            author_name=author_name,
+            comment_id=comment_id,
+            lesson_id=data.lesson_id,
+            course_slug=data.course_slug,
+            lesson_slug=data.lesson_slug,
+            author_avatar=author_avatar,
+            user_lookup_fn=user_lookup,
+        ),
+        notify_parent_author(),
+        return_exceptions=True,
+    )
+    for notif_error in results:
+        if isinstance(notif_error, Exception):
+            logger.warning(
+                "notification_processing_failed",
+                error=str(notif_error),
+                comment_id=str(comment_id),
+            )
+
 
 @router.post(
     "",
@@ -66,17 +154,19 @@ async def create_comment(
     notification_service: NotificationServiceDep,
     auth_service: AuthServiceDep,
     user: CurrentUser,
+    *,
+    background_tasks: BackgroundTasks,
 ) -> CommentResponse:
     """Create a new comment on a lesson.
 
     Rate limited to 10/min, 100/hour per user.
     Content is sanitized and checked for spam.
-    Processes @mentions and creates notifications.
+    Processes @mentions and creates notifications after the response.
     """
     try:
-        user_name = user.name or user.email.split("@")[0]
-        user_avatar = getattr(user, "avatar_url", None)
-        author_id = UUID(str(user.id))
+        user_name = display_name(user)
+        user_avatar = user.avatar_url
+        author_id = user.id
 
         comment = await comment_service.create_comment(
             lesson_id=data.lesson_id,
@@ -96,53 +186,20 @@ async def create_comment(
             lesson_id=data.lesson_id,
         )
 
-        # Process notifications in background (don't fail comment creation)
+        # Notifications are not part of the response, so they run after it
+        # is sent (and never fail comment creation)
         if notification_service and auth_service:
-            try:
-                # Process @mentions and create notifications
-                async def user_lookup(name: str):
-                    """Lookup user by name for @mention resolution."""
-                    return await auth_service.get_user_by_name(name)
-
-                await notification_service.process_mentions(
-                    content=data.content,
-                    author_id=author_id,
-                    author_name=user_name,
-                    comment_id=comment.comment_id,
-                    lesson_id=data.lesson_id,
-                    course_slug=data.course_slug,
-                    lesson_slug=data.lesson_slug,
-                    author_avatar=user_avatar,
-                    user_lookup_fn=user_lookup,
-                )
-
-                # Notify parent comment author if this is a reply
-                if data.parent_id:
-                    # Find parent comment author
-                    parent_comment = await comment_service.find_comment_by_id(
-                        data.lesson_id, data.parent_id
-                    )
-                    if parent_comment:
-                        await notification_service.notify_reply(
-                            comment_author_id=parent_comment.author_id,
-                            replier_id=author_id,
-                            replier_name=user_name,
-                            reply_comment_id=comment.comment_id,
-                            parent_comment_id=data.parent_id,
-                            lesson_id=data.lesson_id,
-                            course_slug=data.course_slug,
-                            lesson_slug=data.lesson_slug,
-                            reply_content=data.content,
-                            replier_avatar=user_avatar,
-                        )
-
-            except Exception as notif_error:
-                # Log but don't fail the comment creation
-                logger.warning(
-                    "notification_processing_failed",
-                    error=str(notif_error),
-                    comment_id=str(comment.comment_id),
-                )
+            background_tasks.add_task(
+                _send_comment_notifications,
+                data=data,
+                comment_id=comment.comment_id,
+                author_id=author_id,
+                author_name=user_name,
+                author_avatar=user_avatar,
+                comment_service=comment_service,
+                notification_service=notification_service,
+                auth_service=auth_service,
+            )
 
         # Get reactions (empty for new comment)
         reactions = await comment_service.get_reaction_counts(comment.comment_id)
@@ -164,20 +221,24 @@ async def list_lesson_comments(
     user: OptionalUser,
     limit: int = Query(default=20, le=100, ge=1),
     cursor: str | None = None,
-) -> CommentListResponse:
+) -> Response:
     """Get top-level comments for a lesson.
 
     Uses cursor-based pagination for efficiency.
     Returns only root comments (no replies).
     """
-    user_id = UUID(str(user.id)) if user else None
+    user_id = user.id if user else None
 
-    return await comment_service.get_comments(
-        lesson_id=lesson_id,
-        limit=limit,
-        cursor=cursor,
-        user_id=user_id,
-    )
+    try:
+        comments = await comment_service.get_comments(
+            lesson_id=lesson_id,
+            limit=limit,
+            cursor=cursor,
+            user_id=user_id,
+        )
+    except CommentError as e:
+        raise handle_comment_error(e) from e
+    return _json_response(comments.model_dump_json())
 
 
 @router.get(
@@ -188,7 +249,7 @@ async def list_lesson_comments(
 async def get_lesson_rating_stats(
     lesson_id: UUID,
     comment_service: CommentServiceDep,
-) -> RatingStatsResponse:
+) -> Response:
     """Get rating statistics for a lesson.
 
     Returns:
@@ -196,7 +257,8 @@ async def get_lesson_rating_stats(
     - Average rating (1-5)
     - Distribution of ratings per star
     """
-    return await comment_service.get_rating_stats(lesson_id)
+    stats = await comment_service.get_rating_stats(lesson_id)
+    return _json_response(stats.model_dump_json())
 
 
 @router.get(
@@ -210,19 +272,20 @@ async def get_comment_replies(
     comment_service: CommentServiceDep,
     user: OptionalUser,
     limit: int = Query(default=50, le=100, ge=1),
-) -> list[CommentResponse]:
+) -> Response:
     """Get replies to a specific comment.
 
     Returns direct children only (not nested).
     """
-    user_id = UUID(str(user.id)) if user else None
+    user_id = user.id if user else None
 
-    return await comment_service.get_replies(
+    replies = await comment_service.get_replies(
         lesson_id=lesson_id,
         parent_id=comment_id,
         limit=limit,
         user_id=user_id,
     )
+    return _json_response(_REPLIES_ADAPTER.dump_json(replies))
 
 
 @router.put(
@@ -235,8 +298,8 @@ async def update_comment(
     data: UpdateCommentRequest,
     comment_service: CommentServiceDep,
     user: CurrentUser,
-    lesson_id: UUID = Query(..., description="Lesson ID for comment lookup"),
-    created_at: datetime = Query(..., description="Comment creation timestamp"),
+    lesson_id: LessonIdQuery,
+    created_at: CreatedAtQuery,
 ) -> CommentResponse:
     """Update a comment's content.
 
@@ -249,15 +312,18 @@ async def update_comment(
             comment_id=comment_id,
             created_at=created_at,
             content=data.content,
-            user_id=UUID(str(user.id)),
+            user_id=user.id,
         )
 
-        reactions = await comment_service.get_reaction_counts(comment.comment_id)
-        user_reaction = await comment_service.get_user_reaction(
-            comment.comment_id, UUID(str(user.id))
+        reactions, user_reaction, reply_count = await asyncio.gather(
+            comment_service.get_reaction_counts(comment.comment_id),
+            comment_service.get_user_reaction(comment.comment_id, user.id),
+            comment_service.count_replies(comment.lesson_id, comment.comment_id),
         )
 
-        return CommentResponse.from_comment(comment, reactions, user_reaction)
+        return CommentResponse.from_comment(
+            comment, reactions, user_reaction, reply_count=reply_count
+        )
 
     except CommentError as e:
         raise handle_comment_error(e) from e
@@ -272,8 +338,8 @@ async def delete_comment(
     comment_id: UUID,
     comment_service: CommentServiceDep,
     user: CurrentUser,
-    lesson_id: UUID = Query(..., description="Lesson ID for comment lookup"),
-    created_at: datetime = Query(..., description="Comment creation timestamp"),
+    lesson_id: LessonIdQuery,
+    created_at: CreatedAtQuery,
     reason: str | None = Query(None, description="Deletion reason (moderators only)"),
 ) -> None:
     """Soft delete a comment.
@@ -286,7 +352,7 @@ async def delete_comment(
             lesson_id=lesson_id,
             comment_id=comment_id,
             created_at=created_at,
-            user_id=UUID(str(user.id)),
+            user_id=user.id,
             is_moderator=is_moderator(user),
             reason=reason,
         )
@@ -316,21 +382,17 @@ async def add_reaction(
     Notifies the comment author about the reaction.
     """
     try:
-        reactor_id = UUID(str(user.id))
-        reactor_name = user.name or user.email.split("@")[0]
-        reactor_avatar = getattr(user, "avatar_url", None)
+        reactor_id = user.id
+        reactor_name = display_name(user)
+        reactor_avatar = user.avatar_url
 
-        # Check if user already has this reaction (toggle behavior)
-        existing_reaction = await comment_service.get_user_reaction(
-            comment_id, reactor_id
-        )
-        is_toggle_off = existing_reaction == data.reaction_type.value
-
-        result = await comment_service.add_reaction(
+        # Same reaction again removes it (toggle behavior)
+        result, added = await comment_service.toggle_reaction(
             comment_id=comment_id,
             user_id=reactor_id,
             reaction_type=data.reaction_type,
         )
+        is_toggle_off = not added
 
         # Emit business event for metrics (only if adding, not toggling off)
         if not is_toggle_off:
@@ -385,7 +447,7 @@ async def remove_reaction(
     try:
         return await comment_service.remove_reaction(
             comment_id=comment_id,
-            user_id=UUID(str(user.id)),
+            user_id=user.id,
         )
     except CommentError as e:
         raise handle_comment_error(e) from e
@@ -415,7 +477,7 @@ async def report_comment(
     data: CreateReportRequest,
     comment_service: CommentServiceDep,
     user: CurrentUser,
-    lesson_id: UUID = Query(..., description="Lesson ID for comment lookup"),
+    lesson_id: LessonIdQuery,
 ) -> ReportResponse:
     """Report a comment for moderation.
 
@@ -425,7 +487,7 @@ async def report_comment(
         report = await comment_service.report_comment(
             comment_id=comment_id,
             lesson_id=lesson_id,
-            reporter_id=UUID(str(user.id)),
+            reporter_id=user.id,
             reason=data.reason,
             description=data.description,
         )
@@ -449,12 +511,14 @@ async def list_pending_reports(
     Requires ADMIN or TEACHER role.
     The _user parameter is used for authorization via AdminUser dependency.
     """
-    reports = await comment_service.get_pending_reports(limit)
+    # Fetch one extra report to learn whether there is another page
+    reports = await comment_service.get_pending_reports(limit + 1)
+    page = reports[:limit]
 
     return ReportListResponse(
-        items=[ReportResponse.from_report(r) for r in reports],
-        total=len(reports),
-        has_more=len(reports) >= limit,
+        items=[ReportResponse.from_report(r) for r in page],
+        total=len(page),
+        has_more=len(reports) > limit,
     )
 
 
@@ -468,9 +532,9 @@ async def moderate_report(
     data: ModerateReportRequest,
     comment_service: CommentServiceDep,
     user: AdminUser,
-    comment_id: UUID = Query(..., description="Comment ID being reported"),
-    lesson_id: UUID = Query(..., description="Lesson ID for comment lookup"),
-    created_at: datetime = Query(..., description="Comment creation timestamp"),
+    comment_id: Annotated[UUID, Query(description="Comment ID being reported")],
+    lesson_id: LessonIdQuery,
+    created_at: CreatedAtQuery,
 ) -> MessageResponse:
     """Take action on a reported comment.
 
@@ -481,27 +545,17 @@ async def moderate_report(
 
     Requires ADMIN or TEACHER role.
     """
-    # Moderate the report
+    # Moderate the report (and remove the comment, for remove/warn)
     await comment_service.moderate_report(
         comment_id=comment_id,
         report_id=report_id,
-        moderator_id=UUID(str(user.id)),
+        moderator_id=user.id,
         action=data.action,
         notes=data.notes,
+        lesson_id=lesson_id,
+        created_at=created_at,
     )
 
-    # If action requires comment removal
-    if data.action in ("remove", "warn"):
-        with contextlib.suppress(CommentNotFoundError):
-            await comment_service.delete_comment(
-                lesson_id=lesson_id,
-                comment_id=comment_id,
-                created_at=created_at,
-                user_id=UUID(str(user.id)),
-                is_moderator=True,
-                reason=f"Removido por moderacao: {data.notes or 'Sem detalhes'}",
-            )
-
     return MessageResponse(
         message=f"Denuncia processada com acao: {data.action}",
         success=True,
@@ -535,7 +589,7 @@ async def block_user(
 
     return await comment_service.block_user(
         user_id=user_id,
-        moderator_id=UUID(str(user.id)),
+        moderator_id=user.id,
         reason=data.reason,
         moderator_notes=data.moderator_notes,
         duration_days=data.duration_days,
@@ -566,7 +620,7 @@ async def unblock_user(
     success = await comment_service.unblock_user(
         user_id=user_id,
         block_id=block_id,
-        moderator_id=UUID(str(user.id)),
+        moderator_id=user.id,
         notes=data.notes,
     )
 
@@ -622,7 +676,7 @@ async def check_user_blocked(
         - Moderators can check any user's status
     """
     # Security: Users can only check their own status (unless moderator)
-    if not is_moderator(current_user) and UUID(str(current_user.id)) != user_id:
+    if not is_moderator(current_user) and current_user.id != user_id:
         raise CommentError("Usuarios podem verificar apenas seu proprio status")
 
     is_blocked = await comment_service.is_user_blocked(user_id)
@@ -8,11 +8,12 @@ Request/Response models with validation for:
 """
 
 import base64
-import json
-from datetime import datetime
+import struct
+from datetime import UTC, datetime, timedelta
 from typing import Any
 from uuid import UUID
 
+import orjson
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 # ==============================================================================
@@ -155,6 +156,33 @@ class ReactionCountsResponse(BaseModel):
     angry: int = 0
     total: int = 0
 
+    @classmethod
+    def from_counts(cls, counts: dict[str, int]) -> "ReactionCountsResponse":
+        """Build from a reaction_type -> count mapping.
+
+        Keys may be plain strings or ReactionType members (a str enum hashes
+        like its value). Unknown reaction types are ignored, so total always
+        matches the individual fields.
+        """
+        get = counts.get
+        like = get("like", 0)
+        love = get("love", 0)
+        laugh = get("laugh", 0)
+        sad = get("sad", 0)
+        angry = get("angry", 0)
+        # Counts come from our own store, so skip validation
+        return cls.model_construct(
+            like=like,
+            love=love,
+            laugh=laugh,
+            sad=sad,
+            angry=angry,
+            total=like + love + laugh + sad + angry,
+        )
+
+
+DELETED_COMMENT_CONTENT = "[Comentario removido]"
+
 
 class CommentResponse(BaseModel):
     """Response for a single comment."""
@@ -187,6 +215,9 @@ class CommentResponse(BaseModel):
     ) -> "CommentResponse":
         """Create response from Comment entity.
 
+        The entity is already typed, so the response is built with
+        model_construct and skips field validation.
+
         Args:
             comment: Comment entity
             reactions: Reaction counts by type
@@ -196,21 +227,16 @@ class CommentResponse(BaseModel):
         # Handle deleted comments
         content = comment.content
         if comment.is_deleted:
-            content = "[Comentario removido]"
+            content = DELETED_COMMENT_CONTENT
             if comment.delete_reason:
                 content = f"[Removido: {comment.delete_reason}]"
 
         # Build reaction counts
-        reaction_counts = ReactionCountsResponse()
-        if reactions:
-            reaction_counts = ReactionCountsResponse(
-                like=reactions.get("like", 0),
-                love=reactions.get("love", 0),
-                laugh=reactions.get("laugh", 0),
-                sad=reactions.get("sad", 0),
-                angry=reactions.get("angry", 0),
-                total=sum(reactions.values()),
-            )
+        reaction_counts = (
+            ReactionCountsResponse.from_counts(reactions)
+            if reactions
+            else ReactionCountsResponse.model_construct()
+        )
 
         # Use provided reply_count if given, otherwise use from comment
         actual_reply_count = (
@@ -222,11 +248,11 @@ class CommentResponse(BaseModel):
         # is_review can be None in database for old comments, default to False
         is_review = getattr(comment, "is_review", False) or False
 
-        return cls(
+        return cls.model_construct(
             id=comment.comment_id,
             lesson_id=comment.lesson_id,
             parent_id=comment.parent_id,
-            author=AuthorResponse(
+            author=AuthorResponse.model_construct(
                 id=comment.author_id,
                 name=comment.author_name,
                 avatar=comment.author_avatar,
@@ -252,10 +278,14 @@ class CommentWithRepliesResponse(CommentResponse):
 
 
 class CommentListResponse(BaseModel):
-    """Paginated list of comments."""
+    """Paginated list of comments.
+
+    total is only counted for the first page (no cursor); later pages
+    leave it unset and use has_more.
+    """
 
     items: list[CommentResponse]
-    total: int
+    total: int | None = None
     has_more: bool
     next_cursor: str | None = None
 
@@ -339,13 +369,17 @@ class UserBlockResponse(BaseModel):
 
     @classmethod
     def from_block(
-        cls, block: Any, moderator_name: str | None = None
+        cls,
+        block: Any,
+        moderator_name: str | None = None,
+        now: datetime | None = None,
     ) -> "UserBlockResponse":
         """Create response from UserCommentBlock entity.
 
         Args:
             block: UserCommentBlock entity
             moderator_name: Name of the moderator who created the block
+            now: Current UTC time for the is_active check
         """
         return cls(
             id=block.block_id,
@@ -357,7 +391,7 @@ class UserBlockResponse(BaseModel):
             moderator_notes=block.moderator_notes,
             expires_at=block.expires_at,
             is_permanent=block.is_permanent,
-            is_active=block.is_active(),
+            is_active=block.is_active(now),
         )
 
 
@@ -374,21 +408,54 @@ class UserBlockListResponse(BaseModel):
 # ==============================================================================
 
 
+# Cursor layout: signed microseconds since the epoch + the 16 UUID bytes
+_CURSOR_STRUCT = struct.Struct(">q16s")
+_CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+# Binary cursors are 32 characters; legacy JSON cursors run to ~130
+MAX_CURSOR_LENGTH = 256
+
+
 def encode_cursor(created_at: datetime, comment_id: UUID) -> str:
-    """Encode pagination cursor."""
-    data = {
-        "created_at": created_at.isoformat(),
-        "comment_id": str(comment_id),
-    }
-    json_str = json.dumps(data)
-    return base64.urlsafe_b64encode(json_str.encode()).decode()
+    """Encode pagination cursor as 32 URL-safe base64 characters.
+
+    Naive timestamps (as read from Cassandra) are treated as UTC.
+    """
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=UTC)
+    micros = (created_at - _CURSOR_EPOCH) // _ONE_MICROSECOND
+    raw = _CURSOR_STRUCT.pack(micros, comment_id.bytes)
+    return base64.urlsafe_b64encode(raw).decode("ascii")
 
 
 def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
-    """Decode pagination cursor."""
-    json_str = base64.urlsafe_b64decode(cursor.encode()).decode()
-    data = json.loads(json_str)
-    return (
-        datetime.fromisoformat(data["created_at"]),
-        UUID(data["comment_id"]),
-    )
+    """Decode pagination cursor.
+
+    Also accepts the older base64 JSON cursors, so links issued before
+    the binary layout keep working.
+
+    Raises:
+        ValueError: If the cursor is too long or malformed
+    """
+    if len(cursor) > MAX_CURSOR_LENGTH:
+        raise ValueError("Invalid cursor")
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        if len(raw) == _CURSOR_STRUCT.size:
+            micros, id_bytes = _CURSOR_STRUCT.unpack(raw)
+            return _CURSOR_EPOCH + micros * _ONE_MICROSECOND, UUID(bytes=id_bytes)
+        data = orjson.loads(raw)
+        return (
+            datetime.fromisoformat(data["created_at"]),
+            UUID(data["comment_id"]),
+        )
+    # Cursors come from clients: out-of-range timestamps, JSON of the wrong
+    # shape or wrong field types all surface as the same ValueError
+    except (
+        struct.error,
+        OverflowError,
+        TypeError,
+        KeyError,
+        ValueError,
+    ) as e:
+        raise ValueError("Invalid cursor") from e
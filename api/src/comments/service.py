@@ -7,18 +7,19 @@ Business logic for:
 - Spam detection and rate limiting
 """
 
+import asyncio
 import hashlib
 import html
-import json
 import re
 from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
 from .models import (
     Comment,
+    CommentEdit,
     CommentReply,
     CommentReport,
     ModeratorAction,
@@ -30,11 +31,14 @@ from .models import (
     create_comment,
     create_report,
     create_user_block,
+    reaction_count_shard,
 )
 from .schemas import (
+    AuthorResponse,
     CommentListResponse,
     CommentResponse,
     RatingStatsResponse,
+    ReactionCountsResponse,
     UserBlockListResponse,
     UserBlockResponse,
     decode_cursor,
@@ -96,6 +100,13 @@ class EditWindowExpiredError(CommentError):
         super().__init__(message, "edit_window_expired")
 
 
+class InvalidCursorError(CommentError):
+    """Pagination cursor could not be decoded."""
+
+    def __init__(self, message: str = "Cursor de paginacao invalido"):
+        super().__init__(message, "invalid_cursor")
+
+
 # ==============================================================================
 # Content Sanitization
 # ==============================================================================
@@ -104,8 +115,9 @@ class EditWindowExpiredError(CommentError):
 # Allowed HTML tags (basic formatting only)
 ALLOWED_TAGS = {"b", "i", "em", "strong", "code", "pre"}
 
-# Spam keywords (basic list - extend as needed)
-SPAM_KEYWORDS = {
+# Spam keywords (basic list - extend as needed). Only ever scanned in order,
+# never membership-tested, so a tuple rather than a set
+SPAM_KEYWORDS = (
     "viagra",
     "cialis",
     "casino",
@@ -116,11 +128,16 @@ SPAM_KEYWORDS = {
     "act now",
     "limited time",
     "buy now",
-}
+)
 
 # URL pattern for detection
 URL_PATTERN = re.compile(r"https?://[^\s]+", re.IGNORECASE)
 
+# Escaped allowed tags, restored in a single pass by sanitize_content
+_ALLOWED_TAG_PATTERN = re.compile(
+    r"&lt;(/?(?:" + "|".join(sorted(ALLOWED_TAGS)) + r"))&gt;"
+)
+
 
 def sanitize_content(content: str) -> str:
     """Sanitize comment content to prevent XSS.
@@ -129,17 +146,9 @@ def sanitize_content(content: str) -> str:
     - Allows only safe formatting tags
     - Strips dangerous attributes
     """
-    # First escape all HTML
-    escaped = html.escape(content)
-
-    # Re-enable allowed tags (simple approach)
-    for tag in ALLOWED_TAGS:
-        # Opening tags
-        escaped = escaped.replace(f"&lt;{tag}&gt;", f"<{tag}>")
-        # Closing tags
-        escaped = escaped.replace(f"&lt;/{tag}&gt;", f"</{tag}>")
-
-    return escaped
+    # First escape all HTML, then re-enable allowed tags (opening and
+    # closing) in one scan
+    return _ALLOWED_TAG_PATTERN.sub(r"<\1>", html.escape(content))
 
 
 def is_spam(content: str, _user_id: UUID | None = None) -> bool:
@@ -154,37 +163,71 @@ def is_spam(content: str, _user_id: UUID | None = None) -> bool:
         content: Comment text to check
         _user_id: Reserved for future per-user spam detection
     """
-    content_lower = content.lower()
-
-    # Too short - allow short comments
-    words = content.split()
+    # Too short - allow short comments (split at most once: only whether
+    # there is a second word matters)
     min_words = 2
-    if len(words) < min_words:
+    if len(content.split(maxsplit=min_words - 1)) < min_words:
         return False
 
-    # Too many URLs
-    urls = URL_PATTERN.findall(content)
+    # Too many URLs - stop scanning at the first one over the limit
     max_urls = 3
-    if len(urls) > max_urls:
-        return True
+    for url_count, _match in enumerate(URL_PATTERN.finditer(content), 1):
+        if url_count > max_urls:
+            return True
 
-    # Spam keywords - use any() for cleaner code
+    # Spam keywords - lowercase only once the cheaper checks have passed
+    content_lower = content.lower()
     return any(keyword in content_lower for keyword in SPAM_KEYWORDS)
 
 
+def _decode_reaction_hash(cached: dict) -> dict[str, int]:
+    """Decode a cached reactions hash from Redis.
+
+    Handles both bytes and str keys (depends on decode_responses setting).
+    """
+    return {
+        (k.decode() if isinstance(k, bytes) else k): int(v) for k, v in cached.items()
+    }
+
+
+def _sum_reaction_shards(rows: Any) -> dict[UUID, dict[str, int]]:
+    """Sum sharded reaction counter rows per comment and reaction type.
+
+    Reaction types whose shards add up to zero or less are left out.
+    """
+    totals: dict[UUID, dict[str, int]] = {}
+    for row in rows:
+        if row.count:
+            counts = totals.setdefault(row.comment_id, {})
+            counts[row.reaction_type] = counts.get(row.reaction_type, 0) + row.count
+    return {
+        comment_id: {kind: count for kind, count in counts.items() if count > 0}
+        for comment_id, counts in totals.items()
+    }
+
+
 def content_hash(content: str) -> str:
     """Generate hash of content for duplicate detection.
 
-    Uses SHA256 for secure hashing (not cryptographic security,
-    just for content fingerprinting).
+    Uses a 16-byte BLAKE2b digest: this is content fingerprinting, not
+    security, and BLAKE2b is faster than SHA256 on short inputs. The
+    32-character hex digest keeps the length of the old SHA256 prefix.
     """
-    return hashlib.sha256(content.encode()).hexdigest()[:32]
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
 
 # ==============================================================================
 # Comment Service
 # ==============================================================================
 
+# Explicit comments columns; legacy tables may still carry content_history,
+# which is no longer read (see comment_content_history)
+COMMENT_LIST_COLUMNS = (
+    "lesson_id, comment_id, parent_id, author_id, author_name, author_avatar, "
+    "content, is_edited, edited_at, is_deleted, deleted_at, deleted_by, "
+    "delete_reason, reply_count, rating, is_review, created_at, updated_at"
+)
+
 
 class CommentService:
     """Service for comment management."""
@@ -197,6 +240,9 @@ class CommentService:
     COMMENTS_PER_HOUR = 100
     REPORTS_PER_HOUR = 5
 
+    # Partitions per IN query when loading reaction/reply counts for a page
+    REACTION_COUNTS_BATCH_SIZE = 50
+
     def __init__(self, session: "Session", keyspace: str, redis: "Redis | None" = None):
         """Initialize with Cassandra session and optional Redis."""
         self.session = session
@@ -207,35 +253,66 @@ class CommentService:
     def _prepare_statements(self) -> None:
         """Prepare CQL statements for efficient queries."""
         # Comment CRUD
-        self._insert_comment = self.session.prepare(f"""
+        insert_comment = f"""
             INSERT INTO {self.keyspace}.comments
             (lesson_id, comment_id, parent_id, author_id, author_name, author_avatar,
-             content, content_history, is_edited, edited_at, is_deleted, deleted_at,
-             deleted_by, delete_reason, reply_count, rating, is_review, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """)
-
-        self._insert_comment_by_parent = self.session.prepare(f"""
+             content, is_edited, edited_at, is_deleted, deleted_at, deleted_by,
+             delete_reason, reply_count, rating, is_review, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        insert_comment_by_author = f"""
+            INSERT INTO {self.keyspace}.comments_by_author
+            (author_id, created_at, comment_id, lesson_id, parent_id, author_name,
+             author_avatar, content, is_edited, is_deleted, reply_count, rating,
+             is_review)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        insert_comment_by_parent = f"""
             INSERT INTO {self.keyspace}.comments_by_parent
             (lesson_id, parent_id, comment_id, author_id, author_name, author_avatar,
              content, is_edited, is_deleted, reply_count, rating, is_review, created_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+
+        # Denormalized writes go out as one prepared logged batch, so all rows
+        # land in a single round-trip and the tables cannot diverge if a write
+        # fails halfway. Replies are also written to by_parent.
+        self._insert_comment = self.session.prepare(f"""
+            BEGIN BATCH
+            {insert_comment};
+            {insert_comment_by_author};
+            APPLY BATCH
+        """)
+        self._insert_reply = self.session.prepare(f"""
+            BEGIN BATCH
+            {insert_comment};
+            {insert_comment_by_author};
+            {insert_comment_by_parent};
+            APPLY BATCH
         """)
 
         self._get_comments_by_lesson = self.session.prepare(f"""
-            SELECT * FROM {self.keyspace}.comments
+            SELECT {COMMENT_LIST_COLUMNS} FROM {self.keyspace}.comments
             WHERE lesson_id = ?
             ORDER BY created_at DESC
             LIMIT ?
         """)
 
         self._get_comments_by_lesson_cursor = self.session.prepare(f"""
-            SELECT * FROM {self.keyspace}.comments
+            SELECT {COMMENT_LIST_COLUMNS} FROM {self.keyspace}.comments
             WHERE lesson_id = ? AND created_at < ?
             ORDER BY created_at DESC
             LIMIT ?
         """)
 
+        # Rows sharing the cursor's created_at that sort after its comment_id
+        # (comment_id clusters ASC, so no single tuple slice covers both)
+        self._get_comments_by_lesson_cursor_ties = self.session.prepare(f"""
+            SELECT {COMMENT_LIST_COLUMNS} FROM {self.keyspace}.comments
+            WHERE lesson_id = ? AND created_at = ? AND comment_id > ?
+            LIMIT ?
+        """)
+
         self._get_replies = self.session.prepare(f"""
             SELECT * FROM {self.keyspace}.comments_by_parent
             WHERE lesson_id = ? AND parent_id = ?
@@ -244,25 +321,31 @@ class CommentService:
         """)
 
         self._get_comment = self.session.prepare(f"""
-            SELECT * FROM {self.keyspace}.comments
+            SELECT {COMMENT_LIST_COLUMNS} FROM {self.keyspace}.comments
             WHERE lesson_id = ? AND created_at = ? AND comment_id = ?
         """)
 
+        # An edit updates the row and appends the previous version to the
+        # history table in one logged batch
         self._update_comment = self.session.prepare(f"""
+            BEGIN BATCH
             UPDATE {self.keyspace}.comments
-            SET content = ?, content_history = ?, is_edited = ?, edited_at = ?, updated_at = ?
-            WHERE lesson_id = ? AND created_at = ? AND comment_id = ?
+            SET content = ?, is_edited = ?, edited_at = ?, updated_at = ?
+            WHERE lesson_id = ? AND created_at = ? AND comment_id = ?;
+            INSERT INTO {self.keyspace}.comment_content_history
+            (comment_id, edited_at, previous_content)
+            VALUES (?, ?, ?);
+            APPLY BATCH
         """)
 
-        self._soft_delete_comment = self.session.prepare(f"""
-            UPDATE {self.keyspace}.comments
-            SET is_deleted = true, deleted_at = ?, deleted_by = ?, delete_reason = ?, updated_at = ?
-            WHERE lesson_id = ? AND created_at = ? AND comment_id = ?
+        self._get_content_history = self.session.prepare(f"""
+            SELECT * FROM {self.keyspace}.comment_content_history
+            WHERE comment_id = ?
         """)
 
-        self._update_reply_count = self.session.prepare(f"""
+        self._soft_delete_comment = self.session.prepare(f"""
             UPDATE {self.keyspace}.comments
-            SET reply_count = ?
+            SET is_deleted = true, deleted_at = ?, deleted_by = ?, delete_reason = ?, updated_at = ?
             WHERE lesson_id = ? AND created_at = ? AND comment_id = ?
         """)
 
@@ -271,9 +354,9 @@ class CommentService:
             WHERE lesson_id = ?
         """)
 
-        # Count comments by author (uses secondary index)
+        # Count comments by author (single partition of comments_by_author)
         self._count_comments_by_author = self.session.prepare(f"""
-            SELECT COUNT(*) FROM {self.keyspace}.comments
+            SELECT COUNT(*) FROM {self.keyspace}.comments_by_author
             WHERE author_id = ?
         """)
 
@@ -282,6 +365,14 @@ class CommentService:
             WHERE lesson_id = ? AND parent_id = ?
         """)
 
+        # Reply counts for a page of comments in one round-trip
+        self._count_replies_many = self.session.prepare(f"""
+            SELECT parent_id, COUNT(*) AS count
+            FROM {self.keyspace}.comments_by_parent
+            WHERE lesson_id = ? AND parent_id IN ?
+            GROUP BY lesson_id, parent_id
+        """)
+
         # Reactions
         self._insert_reaction = self.session.prepare(f"""
             INSERT INTO {self.keyspace}.comment_reactions
@@ -310,29 +401,44 @@ class CommentService:
             WHERE user_id = ? AND comment_id = ?
         """)
 
+        # A user's reactions to a page of comments (single partition)
+        self._get_user_reactions_many = self.session.prepare(f"""
+            SELECT comment_id, reaction_type
+            FROM {self.keyspace}.user_comment_reactions
+            WHERE user_id = ? AND comment_id IN ?
+        """)
+
         self._get_reactions = self.session.prepare(f"""
             SELECT * FROM {self.keyspace}.comment_reactions
             WHERE comment_id = ?
         """)
 
-        # Reaction counts (counter table)
+        # Reaction counts (sharded counter table)
         self._incr_reaction_count = self.session.prepare(f"""
-            UPDATE {self.keyspace}.comment_reaction_counts
+            UPDATE {self.keyspace}.comment_reaction_count_shards
             SET count = count + 1
-            WHERE comment_id = ? AND reaction_type = ?
+            WHERE comment_id = ? AND reaction_type = ? AND shard = ?
         """)
 
         self._decr_reaction_count = self.session.prepare(f"""
-            UPDATE {self.keyspace}.comment_reaction_counts
+            UPDATE {self.keyspace}.comment_reaction_count_shards
             SET count = count - 1
-            WHERE comment_id = ? AND reaction_type = ?
+            WHERE comment_id = ? AND reaction_type = ? AND shard = ?
         """)
 
         self._get_reaction_counts = self.session.prepare(f"""
-            SELECT * FROM {self.keyspace}.comment_reaction_counts
+            SELECT comment_id, reaction_type, count
+            FROM {self.keyspace}.comment_reaction_count_shards
             WHERE comment_id = ?
         """)
 
+        # Reaction counts for a page of comments in one round-trip
+        self._get_reaction_counts_many = self.session.prepare(f"""
+            SELECT comment_id, reaction_type, count
+            FROM {self.keyspace}.comment_reaction_count_shards
+            WHERE comment_id IN ?
+        """)
+
         # Reports
         self._insert_report = self.session.prepare(f"""
             INSERT INTO {self.keyspace}.comment_reports
@@ -354,12 +460,71 @@ class CommentService:
             LIMIT ?
         """)
 
+        self._get_report = self.session.prepare(f"""
+            SELECT status, created_at, lesson_id, reporter_id, reason
+            FROM {self.keyspace}.comment_reports
+            WHERE comment_id = ? AND report_id = ?
+        """)
+
+        # Moderation moves the report between status partitions in the same
+        # logged batch, so the pending queue only holds open reports instead
+        # of growing into one ever-larger partition. Reports moderated before
+        # this move existed are cleared from 'pending' by migration 005.
         self._update_report = self.session.prepare(f"""
+            BEGIN BATCH
+            UPDATE {self.keyspace}.comment_reports
+            SET status = ?, moderator_id = ?, moderator_notes = ?, reviewed_at = ?
+            WHERE comment_id = ? AND report_id = ?;
+            DELETE FROM {self.keyspace}.comment_reports_by_status
+            WHERE status = ? AND created_at = ? AND report_id = ?;
+            INSERT INTO {self.keyspace}.comment_reports_by_status
+            (status, created_at, report_id, comment_id, lesson_id, reporter_id, reason)
+            VALUES (?, ?, ?, ?, ?, ?, ?);
+            APPLY BATCH
+        """)
+
+        # Re-moderation with the same outcome: the report already sits in
+        # its status partition. Deleting and re-inserting that row in one
+        # batch would share a write timestamp, and the delete would win.
+        self._update_report_status = self.session.prepare(f"""
             UPDATE {self.keyspace}.comment_reports
             SET status = ?, moderator_id = ?, moderator_notes = ?, reviewed_at = ?
             WHERE comment_id = ? AND report_id = ?
         """)
 
+        # Moderation that also removes the comment, as one batch. Two
+        # concurrent moderations with different outcomes can both read the
+        # old status and each insert their own status row; comment_reports
+        # keeps the last write and stays the source of truth for the status.
+        self._update_report_and_delete_comment = self.session.prepare(f"""
+            BEGIN BATCH
+            UPDATE {self.keyspace}.comment_reports
+            SET status = ?, moderator_id = ?, moderator_notes = ?, reviewed_at = ?
+            WHERE comment_id = ? AND report_id = ?;
+            DELETE FROM {self.keyspace}.comment_reports_by_status
+            WHERE status = ? AND created_at = ? AND report_id = ?;
+            INSERT INTO {self.keyspace}.comment_reports_by_status
+            (status, created_at, report_id, comment_id, lesson_id, reporter_id, reason)
+            VALUES (?, ?, ?, ?, ?, ?, ?);
+            UPDATE {self.keyspace}.comments
+            SET is_deleted = true, deleted_at = ?, deleted_by = ?, delete_reason = ?, updated_at = ?
+            WHERE lesson_id = ? AND created_at = ? AND comment_id = ?;
+            APPLY BATCH
+        """)
+
+        # Same as above when the report status does not change, skipping the
+        # status partition rows (see _update_report_status)
+        self._update_report_status_and_delete_comment = self.session.prepare(f"""
+            BEGIN BATCH
+            UPDATE {self.keyspace}.comment_reports
+            SET status = ?, moderator_id = ?, moderator_notes = ?, reviewed_at = ?
+            WHERE comment_id = ? AND report_id = ?;
+            UPDATE {self.keyspace}.comments
+            SET is_deleted = true, deleted_at = ?, deleted_by = ?, delete_reason = ?, updated_at = ?
+            WHERE lesson_id = ? AND created_at = ? AND comment_id = ?;
+            APPLY BATCH
+        """)
+
         # User blocks
         self._check_user_blocked = self.session.prepare(f"""
             SELECT * FROM {self.keyspace}.user_comment_blocks
@@ -388,6 +553,27 @@ class CommentService:
             LIMIT ?
         """)
 
+        self._insert_user_block = self.session.prepare(f"""
+            INSERT INTO {self.keyspace}.user_comment_blocks
+            (user_id, block_id, blocked_at, blocked_by, reason, moderator_notes,
+             expires_at, is_permanent)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """)
+
+        self._insert_block_by_moderator = self.session.prepare(f"""
+            INSERT INTO {self.keyspace}.comment_blocks_by_moderator
+            (moderator_id, block_id, user_id, blocked_at, reason, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """)
+
+        # Moderator audit log
+        self._insert_audit_log = self.session.prepare(f"""
+            INSERT INTO {self.keyspace}.moderator_audit_log
+            (log_id, moderator_id, action, target_user_id, target_id, performed_at,
+             details, ip_address, user_agent)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """)
+
     # ==========================================================================
     # Rate Limiting (Redis-based)
     # ==========================================================================
@@ -474,7 +660,7 @@ class CommentService:
         - Spam detection
         - Duplicate check
         - Content sanitization
-        - Dual-write to main and by_parent tables
+        - Write to main, by_author and by_parent tables in one logged batch
         """
         # Check if user is blocked from commenting
         if await self.is_user_blocked(author_id):
@@ -508,57 +694,60 @@ class CommentService:
             is_review=is_review,
         )
 
-        # Insert to main table
-        await self.session.aexecute(
-            self._insert_comment,
-            [
+        # Bind values in statement order: comments, by_author, then by_parent
+        values = [
+            comment.lesson_id,
+            comment.comment_id,
+            comment.parent_id,
+            comment.author_id,
+            comment.author_name,
+            comment.author_avatar,
+            comment.content,
+            comment.is_edited,
+            comment.edited_at,
+            comment.is_deleted,
+            comment.deleted_at,
+            comment.deleted_by,
+            comment.delete_reason,
+            comment.reply_count,
+            comment.rating,
+            comment.is_review,
+            comment.created_at,
+            comment.updated_at,
+            comment.author_id,
+            comment.created_at,
+            comment.comment_id,
+            comment.lesson_id,
+            comment.parent_id,
+            comment.author_name,
+            comment.author_avatar,
+            comment.content,
+            comment.is_edited,
+            comment.is_deleted,
+            comment.reply_count,
+            comment.rating,
+            comment.is_review,
+        ]
+        if parent_id:
+            values += [
                 comment.lesson_id,
-                comment.comment_id,
                 comment.parent_id,
+                comment.comment_id,
                 comment.author_id,
                 comment.author_name,
                 comment.author_avatar,
                 comment.content,
-                comment.content_history,
                 comment.is_edited,
-                comment.edited_at,
                 comment.is_deleted,
-                comment.deleted_at,
-                comment.deleted_by,
-                comment.delete_reason,
                 comment.reply_count,
                 comment.rating,
                 comment.is_review,
                 comment.created_at,
-                comment.updated_at,
-            ],
+            ]
+        await self.session.aexecute(
+            self._insert_reply if parent_id else self._insert_comment, values
         )
 
-        # Insert to by_parent table for efficient reply queries (only for replies)
-        if parent_id:
-            await self.session.aexecute(
-                self._insert_comment_by_parent,
-                [
-                    comment.lesson_id,
-                    comment.parent_id,
-                    comment.comment_id,
-                    comment.author_id,
-                    comment.author_name,
-                    comment.author_avatar,
-                    comment.content,
-                    comment.is_edited,
-                    comment.is_deleted,
-                    comment.reply_count,
-                    comment.rating,
-                    comment.is_review,
-                    comment.created_at,
-                ],
-            )
-
-        # Update parent reply count if this is a reply
-        if parent_id:
-            await self._increment_reply_count(lesson_id, parent_id)
-
         # Increment rate limit
         await self.increment_rate_limit(author_id)
 
@@ -567,39 +756,12 @@ class CommentService:
 
         return comment
 
-    async def _increment_reply_count(self, lesson_id: UUID, parent_id: UUID) -> None:
-        """Increment reply count on parent comment.
-
-        Finds the parent comment, gets its current reply_count,
-        and increments it by 1.
-        """
-        parent = await self.find_comment_by_id(lesson_id, parent_id)
-        if parent:
-            new_count = parent.reply_count + 1
-            await self.session.aexecute(
-                self._update_reply_count,
-                [new_count, lesson_id, parent.created_at, parent_id],
-            )
-
-    async def _decrement_reply_count(self, lesson_id: UUID, parent_id: UUID) -> None:
-        """Decrement reply count on parent comment.
-
-        Finds the parent comment, gets its current reply_count,
-        and decrements it by 1 (minimum 0).
-        """
-        parent = await self.find_comment_by_id(lesson_id, parent_id)
-        if parent:
-            new_count = max(0, parent.reply_count - 1)
-            await self.session.aexecute(
-                self._update_reply_count,
-                [new_count, lesson_id, parent.created_at, parent_id],
-            )
-
     async def count_replies(self, lesson_id: UUID, comment_id: UUID) -> int:
         """Count actual replies for a comment from comments_by_parent table.
 
-        This is more reliable than the denormalized reply_count field,
-        especially for existing data where reply_count may not have been updated.
+        The by_parent partition is the source of truth for reply counts. The
+        denormalized reply_count column is no longer maintained, as doing so
+        needed a read-modify-write of the parent on every reply.
 
         Args:
             lesson_id: Lesson ID
@@ -615,11 +777,36 @@ class CommentService:
         row = result[0] if result else None
         return row.count if row else 0
 
+    async def count_replies_many(
+        self, lesson_id: UUID, comment_ids: list[UUID]
+    ) -> dict[UUID, int]:
+        """Count replies for several comments of a lesson at once.
+
+        Groups the by_parent partitions server-side, in IN queries of up to
+        REACTION_COUNTS_BATCH_SIZE partitions each.
+
+        Args:
+            lesson_id: Lesson ID
+            comment_ids: Comment IDs (parents)
+
+        Returns:
+            Mapping of comment_id to its reply count (0 if none)
+        """
+        counts = dict.fromkeys(comment_ids, 0)
+        batch_size = self.REACTION_COUNTS_BATCH_SIZE
+        for start in range(0, len(comment_ids), batch_size):
+            rows = await self.session.aexecute(
+                self._count_replies_many,
+                [lesson_id, comment_ids[start : start + batch_size]],
+            )
+            for row in rows:
+                counts[row.parent_id] = row.count
+        return counts
+
     async def count_comments_by_author(self, author_id: UUID) -> int:
         """Count total comments by a specific author.
 
-        Uses the secondary index on author_id.
-        Note: May be slow for users with many comments.
+        Reads the author's single comments_by_author partition.
 
         Args:
             author_id: Author user ID
@@ -664,6 +851,21 @@ class CommentService:
                 return Comment.from_row(row)
         return None
 
+    async def get_content_history(self, comment_id: UUID) -> list[CommentEdit]:
+        """Get previous versions of a comment, newest first.
+
+        Args:
+            comment_id: Comment ID
+
+        Returns:
+            List of edits (empty if the comment was never edited)
+        """
+        rows = await self.session.aexecute(
+            self._get_content_history,
+            [comment_id],
+        )
+        return [CommentEdit.from_row(row) for row in rows]
+
     async def get_comments(
         self,
         lesson_id: UUID,
@@ -684,43 +886,54 @@ class CommentService:
 
         # Query with or without cursor
         if cursor:
-            created_at, _comment_id = decode_cursor(cursor)
-            rows = await self.session.aexecute(
-                self._get_comments_by_lesson_cursor,
-                [lesson_id, created_at, limit + 1],
+            # Keyset on (created_at, comment_id): first the rest of the
+            # cursor's timestamp, then everything older
+            try:
+                created_at, comment_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise InvalidCursorError from e
+            ties, older = await asyncio.gather(
+                self.session.aexecute(
+                    self._get_comments_by_lesson_cursor_ties,
+                    [lesson_id, created_at, comment_id, limit + 1],
+                ),
+                self.session.aexecute(
+                    self._get_comments_by_lesson_cursor,
+                    [lesson_id, created_at, limit + 1],
+                ),
             )
+            rows = [*ties, *older]
         else:
             rows = await self.session.aexecute(
                 self._get_comments_by_lesson,
                 [lesson_id, limit + 1],
             )
 
-        comments = []
-        for row in rows:
-            # Filter to root comments only (parent_id is None)
-            if row.parent_id is None and not row.is_deleted:
-                comment = Comment.from_row(row)
-                comments.append(comment)
+        # Filter to root comments only (parent_id is None) on the raw rows
+        root_rows = [
+            row for row in rows if row.parent_id is None and not row.is_deleted
+        ]
 
         # Check if there are more
-        has_more = len(comments) > limit
-        if has_more:
-            comments = comments[:limit]
+        has_more = len(root_rows) > limit
+
+        # Only materialize entities for rows that are actually returned
+        comments = [Comment.from_row(row) for row in root_rows[:limit]]
 
         # Get reaction counts, user reactions, and actual reply counts
+        comment_ids = [comment.comment_id for comment in comments]
+        reactions_by_comment = await self.get_reaction_counts_many(comment_ids)
+        # Reply counts come from the comments_by_parent partitions, which stay
+        # correct even for data written before reply_count was tracked
+        reply_counts = await self.count_replies_many(lesson_id, comment_ids)
+        user_reactions = (
+            await self.get_user_reactions_many(user_id, comment_ids) if user_id else {}
+        )
         comment_responses = []
         for comment in comments:
-            reactions = await self.get_reaction_counts(comment.comment_id)
-            user_reaction = None
-            if user_id:
-                user_reaction = await self.get_user_reaction(
-                    comment.comment_id, user_id
-                )
-            # Use actual reply count from comments_by_parent table
-            # This ensures correct count even for existing data
-            actual_reply_count = await self.count_replies(
-                comment.lesson_id, comment.comment_id
-            )
+            reactions = reactions_by_comment[comment.comment_id]
+            user_reaction = user_reactions.get(comment.comment_id)
+            actual_reply_count = reply_counts[comment.comment_id]
             comment_responses.append(
                 CommentResponse.from_comment(
                     comment, reactions, user_reaction, reply_count=actual_reply_count
@@ -733,13 +946,15 @@ class CommentService:
             last = comments[-1]
             next_cursor = encode_cursor(last.created_at, last.comment_id)
 
-        # Get total count
-        result = await self.session.aexecute(
-            self._count_comments_by_lesson,
-            [lesson_id],
-        )
-        count_row = result[0] if result else None
-        total = count_row.count if count_row else 0
+        # Count only for the first page; later pages rely on has_more
+        total = None
+        if not cursor:
+            result = await self.session.aexecute(
+                self._count_comments_by_lesson,
+                [lesson_id],
+            )
+            count_row = result[0] if result else None
+            total = count_row.count if count_row else 0
 
         response = CommentListResponse(
             items=comment_responses,
@@ -767,45 +982,48 @@ class CommentService:
             [lesson_id, parent_id, limit],
         )
 
-        replies = []
-        for row in rows:
-            if not row.is_deleted:
-                comment = CommentReply.from_row(row)
-                reactions = await self.get_reaction_counts(comment.comment_id)
-                user_reaction = None
-                if user_id:
-                    user_reaction = await self.get_user_reaction(
-                        comment.comment_id, user_id
-                    )
-
-                # Get actual reply count from comments_by_parent table
-                actual_reply_count = await self.count_replies(
-                    comment.lesson_id, comment.comment_id
-                )
+        reply_rows = [row for row in rows if not row.is_deleted]
+        reply_ids = [row.comment_id for row in reply_rows]
+        reactions_by_comment = await self.get_reaction_counts_many(reply_ids)
+        reply_counts = await self.count_replies_many(lesson_id, reply_ids)
+        user_reactions = (
+            await self.get_user_reactions_many(user_id, reply_ids) if user_id else {}
+        )
 
-                # Convert to full comment response format
-                replies.append(
-                    CommentResponse(
-                        id=comment.comment_id,
-                        lesson_id=comment.lesson_id,
-                        parent_id=comment.parent_id,
-                        author={
-                            "id": comment.author_id,
-                            "name": comment.author_name,
-                            "avatar": comment.author_avatar,
-                        },
-                        content=comment.content,
-                        is_edited=comment.is_edited,
-                        is_deleted=comment.is_deleted,
-                        reply_count=actual_reply_count,
-                        rating=comment.rating,
-                        is_review=comment.is_review or False,
-                        reactions=reactions,
-                        user_reaction=user_reaction,
-                        created_at=comment.created_at,
-                        updated_at=comment.created_at,
-                    )
+        replies = []
+        for row in reply_rows:
+            comment = CommentReply.from_row(row)
+            reactions = reactions_by_comment[comment.comment_id]
+            user_reaction = user_reactions.get(comment.comment_id)
+            actual_reply_count = reply_counts[comment.comment_id]
+
+            # Convert to full comment response format (typed entity, so
+            # skip validation like CommentResponse.from_comment)
+            replies.append(
+                CommentResponse.model_construct(
+                    id=comment.comment_id,
+                    lesson_id=comment.lesson_id,
+                    parent_id=comment.parent_id,
+                    author=AuthorResponse.model_construct(
+                        id=comment.author_id,
+                        name=comment.author_name,
+                        avatar=comment.author_avatar,
+                    ),
+                    content=comment.content,
+                    is_edited=comment.is_edited,
+                    is_deleted=comment.is_deleted,
+                    reply_count=actual_reply_count,
+                    rating=comment.rating,
+                    is_review=comment.is_review or False,
+                    edited_at=None,
+                    reactions=ReactionCountsResponse.from_counts(reactions),
+                    user_reaction=ReactionType(user_reaction)
+                    if user_reaction
+                    else None,
+                    created_at=comment.created_at,
+                    updated_at=comment.created_at,
                 )
+            )
 
         return replies
 
@@ -853,35 +1071,27 @@ class CommentService:
         # Sanitize new content
         safe_content = sanitize_content(content)
 
-        # Build history entry
-        history = list(comment.content_history)
-        history.append(
-            {
-                "content": comment.content,
-                "edited_at": datetime.now(UTC).isoformat(),
-            }
-        )
-
         now = datetime.now(UTC)
 
-        # Update in database
+        # Update in database, keeping the previous content as history
         await self.session.aexecute(
             self._update_comment,
             [
                 safe_content,
-                history,
                 True,
                 now,
                 now,
                 lesson_id,
                 created_at,
                 comment_id,
+                comment_id,
+                now,
+                comment.content,
             ],
         )
 
         # Update entity
         comment.content = safe_content
-        comment.content_history = history
         comment.is_edited = True
         comment.edited_at = now
         comment.updated_at = now
@@ -944,10 +1154,6 @@ class CommentService:
             ],
         )
 
-        # Decrement reply count on parent if this is a reply
-        if comment.parent_id:
-            await self._decrement_reply_count(lesson_id, comment.parent_id)
-
         # Invalidate cache
         await self._invalidate_cache(lesson_id, comment.parent_id)
 
@@ -965,25 +1171,34 @@ class CommentService:
 
         If user already has a different reaction, it's replaced.
         """
+        counts, _added = await self.toggle_reaction(comment_id, user_id, reaction_type)
+        return counts
+
+    async def toggle_reaction(
+        self,
+        comment_id: UUID,
+        user_id: UUID,
+        reaction_type: ReactionType,
+    ) -> tuple[dict[str, int], bool]:
+        """Toggle a reaction, reporting whether it was added or removed.
+
+        Reacting again with the same type removes the reaction; a different
+        type replaces it. The user's current reaction is read once.
+
+        Returns:
+            Tuple of (updated reaction counts, True if the reaction was added)
+        """
         now = datetime.now(UTC)
 
         # Check existing reaction
         existing = await self.get_user_reaction(comment_id, user_id)
 
         if existing:
+            # Same reaction - remove it (toggle); different - remove old, add new
+            await self._delete_reaction_rows(comment_id, user_id, existing)
             if existing == reaction_type.value:
-                # Same reaction - remove it (toggle)
-                return await self.remove_reaction(comment_id, user_id)
-
-            # Different reaction - remove old, add new
-            await self.session.aexecute(self._delete_reaction, [comment_id, user_id])
-            await self.session.aexecute(
-                self._delete_user_reaction, [user_id, comment_id]
-            )
-            await self.session.aexecute(
-                self._decr_reaction_count,
-                [comment_id, existing],
-            )
+                await self._invalidate_reaction_cache(comment_id)
+                return await self.get_reaction_counts(comment_id), False
 
         # Add new reaction
         await self.session.aexecute(
@@ -996,11 +1211,12 @@ class CommentService:
         )
         await self.session.aexecute(
             self._incr_reaction_count,
-            [comment_id, reaction_type.value],
+            [comment_id, reaction_type.value, reaction_count_shard(user_id)],
         )
+        await self._invalidate_reaction_cache(comment_id)
 
         # Return updated counts
-        return await self.get_reaction_counts(comment_id)
+        return await self.get_reaction_counts(comment_id), True
 
     async def remove_reaction(
         self,
@@ -1012,17 +1228,22 @@ class CommentService:
         existing = await self.get_user_reaction(comment_id, user_id)
 
         if existing:
-            await self.session.aexecute(self._delete_reaction, [comment_id, user_id])
-            await self.session.aexecute(
-                self._delete_user_reaction, [user_id, comment_id]
-            )
-            await self.session.aexecute(
-                self._decr_reaction_count,
-                [comment_id, existing],
-            )
+            await self._delete_reaction_rows(comment_id, user_id, existing)
+            await self._invalidate_reaction_cache(comment_id)
 
         return await self.get_reaction_counts(comment_id)
 
+    async def _delete_reaction_rows(
+        self, comment_id: UUID, user_id: UUID, reaction_type: str
+    ) -> None:
+        """Delete a user's reaction rows and decrement its counter."""
+        await self.session.aexecute(self._delete_reaction, [comment_id, user_id])
+        await self.session.aexecute(self._delete_user_reaction, [user_id, comment_id])
+        await self.session.aexecute(
+            self._decr_reaction_count,
+            [comment_id, reaction_type, reaction_count_shard(user_id)],
+        )
+
     async def get_user_reaction(
         self,
         comment_id: UUID,
@@ -1037,17 +1258,39 @@ class CommentService:
 
         return row.reaction_type if row else None
 
+    async def get_user_reactions_many(
+        self, user_id: UUID, comment_ids: list[UUID]
+    ) -> dict[UUID, str]:
+        """Get a user's reactions to several comments at once.
+
+        Reads the user's single user_comment_reactions partition, in IN
+        queries of up to REACTION_COUNTS_BATCH_SIZE comments each.
+
+        Args:
+            user_id: User ID
+            comment_ids: Comment IDs to look up
+
+        Returns:
+            Mapping of comment_id to reaction type, for reacted comments only
+        """
+        reactions: dict[UUID, str] = {}
+        batch_size = self.REACTION_COUNTS_BATCH_SIZE
+        for start in range(0, len(comment_ids), batch_size):
+            rows = await self.session.aexecute(
+                self._get_user_reactions_many,
+                [user_id, comment_ids[start : start + batch_size]],
+            )
+            for row in rows:
+                reactions[row.comment_id] = row.reaction_type
+        return reactions
+
     async def get_reaction_counts(self, comment_id: UUID) -> dict[str, int]:
         """Get reaction counts for a comment."""
         # Try Redis cache first
         if self.redis:
             cached = await self.redis.hgetall(f"reactions:{comment_id}")
             if cached:
-                # Handle both bytes and str keys (depends on decode_responses setting)
-                return {
-                    (k.decode() if isinstance(k, bytes) else k): int(v)
-                    for k, v in cached.items()
-                }
+                return _decode_reaction_hash(cached)
 
         # Query from DB
         rows = await self.session.aexecute(
@@ -1055,10 +1298,7 @@ class CommentService:
             [comment_id],
         )
 
-        counts = {}
-        for row in rows:
-            if row.count and row.count > 0:
-                counts[row.reaction_type] = row.count
+        counts = _sum_reaction_shards(rows).get(comment_id, {})
 
         # Cache in Redis
         if self.redis and counts:
@@ -1070,6 +1310,64 @@ class CommentService:
 
         return counts
 
+    async def get_reaction_counts_many(
+        self, comment_ids: list[UUID]
+    ) -> dict[UUID, dict[str, int]]:
+        """Get reaction counts for several comments at once.
+
+        Cached counts are fetched in one Redis pipeline and the misses in
+        IN queries of up to REACTION_COUNTS_BATCH_SIZE partitions each, so
+        a page of comments costs a couple of round-trips instead of one
+        per comment.
+
+        Args:
+            comment_ids: Comment IDs to look up
+
+        Returns:
+            Mapping of comment_id to its reaction counts (empty if none)
+        """
+        counts: dict[UUID, dict[str, int]] = {}
+        missing = comment_ids
+
+        if self.redis and comment_ids:
+            pipe = self.redis.pipeline()
+            for comment_id in comment_ids:
+                pipe.hgetall(f"reactions:{comment_id}")
+            cached_hashes = await pipe.execute()
+
+            missing = []
+            for comment_id, cached in zip(comment_ids, cached_hashes, strict=True):
+                if cached:
+                    counts[comment_id] = _decode_reaction_hash(cached)
+                else:
+                    missing.append(comment_id)
+
+        fetched: dict[UUID, dict[str, int]] = {}
+        batch_size = self.REACTION_COUNTS_BATCH_SIZE
+        for start in range(0, len(missing), batch_size):
+            rows = await self.session.aexecute(
+                self._get_reaction_counts_many,
+                [missing[start : start + batch_size]],
+            )
+            fetched.update(_sum_reaction_shards(rows))
+
+        # Cache in Redis. Shards can sum to nothing (e.g. a backfilled
+        # reaction removed later); like the single-comment path, those are
+        # not cached since HSET needs at least one field.
+        to_cache = {cid: c for cid, c in fetched.items() if c}
+        if self.redis and to_cache:
+            pipe = self.redis.pipeline()
+            for comment_id, comment_counts in to_cache.items():
+                key = f"reactions:{comment_id}"
+                pipe.hset(key, mapping={k: str(v) for k, v in comment_counts.items()})
+                pipe.expire(key, 3600)
+            await pipe.execute()
+
+        for comment_id in missing:
+            counts[comment_id] = fetched.get(comment_id, {})
+
+        return counts
+
     # ==========================================================================
     # Reports
     # ==========================================================================
@@ -1135,7 +1433,11 @@ class CommentService:
         return report
 
     async def get_pending_reports(self, limit: int = 50) -> list[CommentReport]:
-        """Get pending reports for moderation."""
+        """Get pending reports for moderation.
+
+        Returns up to ``limit`` reports; ask for one more than a page to
+        learn whether another page exists.
+        """
         rows = await self.session.aexecute(
             self._get_reports_by_status,
             [ReportStatus.PENDING.value, limit],
@@ -1150,6 +1452,9 @@ class CommentService:
         moderator_id: UUID,
         action: str,
         notes: str | None = None,
+        *,
+        lesson_id: UUID | None = None,
+        created_at: datetime | None = None,
     ) -> None:
         """Moderate a reported comment.
 
@@ -1157,6 +1462,14 @@ class CommentService:
         - dismiss: Mark report as dismissed
         - remove: Soft delete the comment
         - warn: Remove comment and flag user
+
+        For remove/warn, pass the comment's lesson_id and created_at: the
+        report update and the soft delete are then written in one batch.
+        A comment that is missing or already deleted is left alone.
+
+        Concurrent moderations of one report are not serialized: if they
+        pick different actions, both may leave a row in
+        comment_reports_by_status, while comment_reports keeps the last one.
         """
         now = datetime.now(UTC)
         status = ReportStatus.REVIEWED
@@ -1166,21 +1479,100 @@ class CommentService:
         elif action in ("remove", "warn"):
             status = ReportStatus.ACTION_TAKEN
 
-        # Update report
-        await self.session.aexecute(
-            self._update_report,
-            [
+        remove_comment = (
+            status is ReportStatus.ACTION_TAKEN
+            and lesson_id is not None
+            and created_at is not None
+        )
+        if remove_comment:
+            report_rows, comment_rows = await asyncio.gather(
+                self.session.aexecute(self._get_report, [comment_id, report_id]),
+                self.session.aexecute(
+                    self._get_comment, [lesson_id, created_at, comment_id]
+                ),
+            )
+        else:
+            report_rows = await self.session.aexecute(
+                self._get_report, [comment_id, report_id]
+            )
+            comment_rows = []
+        report = report_rows[0] if report_rows else None
+        comment = comment_rows[0] if comment_rows else None
+        if comment is not None and comment.is_deleted:
+            comment = None
+
+        # Update report and, if its status changes, move it to the new
+        # status partition
+        report_values = []
+        moved = report is not None and report.status != status.value
+        if report is not None:
+            report_values = [
                 status.value,
                 moderator_id,
                 notes,
                 now,
                 comment_id,
                 report_id,
-            ],
-        )
+            ]
+        if moved:
+            report_values += [
+                report.status,
+                report.created_at,
+                report_id,
+                status.value,
+                report.created_at,
+                report_id,
+                comment_id,
+                report.lesson_id,
+                report.reporter_id,
+                report.reason,
+            ]
+        delete_values = []
+        if comment is not None:
+            delete_values = [
+                now,
+                moderator_id,
+                f"Removido por moderacao: {notes or 'Sem detalhes'}",
+                now,
+                lesson_id,
+                created_at,
+                comment_id,
+            ]
+
+        await self._write_moderation(moved, report_values, delete_values)
 
-        # If action requires comment removal, we need the comment details
-        # This would be implemented in the router with full context
+        if comment is not None:
+            await self._invalidate_cache(lesson_id, comment.parent_id)
+
+    async def _write_moderation(
+        self,
+        moved: bool,
+        report_values: list[Any],
+        delete_values: list[Any],
+    ) -> None:
+        """Write a moderation outcome with as few round trips as possible.
+
+        Args:
+            moved: Whether the report changes status partition
+            report_values: Report update values (empty if no report)
+            delete_values: Comment soft delete values (empty if kept)
+        """
+        if moved and delete_values:
+            await self.session.aexecute(
+                self._update_report_and_delete_comment,
+                report_values + delete_values,
+            )
+        elif moved:
+            await self.session.aexecute(self._update_report, report_values)
+        elif report_values and delete_values:
+            await self.session.aexecute(
+                self._update_report_status_and_delete_comment,
+                report_values + delete_values,
+            )
+        elif report_values:
+            await self.session.aexecute(self._update_report_status, report_values)
+        elif delete_values:
+            await self.session.aexecute(self._soft_delete_comment, delete_values)
 
     # ==========================================================================
     # Rating Statistics
@@ -1198,8 +1590,7 @@ class CommentService:
         if self.redis:
             cached = await self.redis.get(f"rating_stats:{lesson_id}")
             if cached:
-                data = json.loads(cached)
-                return RatingStatsResponse(**data)
+                return RatingStatsResponse.model_validate_json(cached)
 
         # Query all comments with ratings for this lesson
         rows = await self.session.aexecute(
@@ -1213,8 +1604,8 @@ class CommentService:
 
         for row in rows:
             # Only count reviews (is_review=True) with a rating
-            is_review = getattr(row, "is_review", False)
-            rating = getattr(row, "rating", None)
+            is_review = row.is_review
+            rating = row.rating
 
             if is_review and rating is not None and not row.is_deleted:
                 total_reviews += 1
@@ -1235,7 +1626,7 @@ class CommentService:
             await self.redis.setex(
                 f"rating_stats:{lesson_id}",
                 1800,  # 30 minutes TTL
-                json.dumps(response.model_dump(), default=str),
+                response.model_dump_json(),
             )
 
         return response
@@ -1253,8 +1644,7 @@ class CommentService:
         cached = await self.redis.get(key)
 
         if cached:
-            data = json.loads(cached)
-            return CommentListResponse(**data)
+            return CommentListResponse.model_validate_json(cached)
 
         return None
 
@@ -1269,23 +1659,36 @@ class CommentService:
         await self.redis.setex(
             key,
             3600,  # 1 hour TTL
-            json.dumps(response.model_dump(), default=str),
+            response.model_dump_json(),
         )
 
     async def _invalidate_cache(
         self, lesson_id: UUID, parent_id: UUID | None = None
     ) -> None:
-        """Invalidate comment cache for a lesson."""
+        """Invalidate comment cache for a lesson.
+
+        Also drops the lesson's rating stats, since a created, edited or
+        deleted review changes them.
+        """
         if not self.redis:
             return
 
-        # Always invalidate root
-        await self.redis.delete(f"comments:{lesson_id}:root")
+        # Always invalidate root and rating stats
+        await self.redis.delete(
+            f"comments:{lesson_id}:root", f"rating_stats:{lesson_id}"
+        )
 
         # Also invalidate parent's replies cache if applicable
         if parent_id:
             await self.redis.delete(f"comments:{lesson_id}:{parent_id}")
 
+    async def _invalidate_reaction_cache(self, comment_id: UUID) -> None:
+        """Invalidate cached reaction counts for a comment."""
+        if not self.redis:
+            return
+
+        await self.redis.delete(f"reactions:{comment_id}")
+
     # ==============================================================================
     # User Blocking
     # ==============================================================================
@@ -1344,14 +1747,8 @@ class CommentService:
         )
 
         # Insert into user_comment_blocks table (async)
-        insert_block = f"""
-            INSERT INTO {self.keyspace}.user_comment_blocks
-            (user_id, block_id, blocked_at, blocked_by, reason, moderator_notes,
-             expires_at, is_permanent)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """
         await self.session.aexecute(
-            insert_block,
+            self._insert_user_block,
             [
                 block.user_id,
                 block.block_id,
@@ -1365,20 +1762,15 @@ class CommentService:
         )
 
         # Insert into moderator activity log (async)
-        insert_log = f"""
-            INSERT INTO {self.keyspace}.comment_blocks_by_moderator
-            (moderator_id, block_id, user_id, blocked_at, reason, is_permanent)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """
         await self.session.aexecute(
-            insert_log,
+            self._insert_block_by_moderator,
             [
                 moderator_id,
                 block.block_id,
                 user_id,
                 block.blocked_at,
                 reason,
-                block.is_permanent,
+                block.expires_at,
             ],
         )
 
@@ -1389,16 +1781,12 @@ class CommentService:
             target_user_id=user_id,
             target_id=block.block_id,
             details=f"Reason: {reason}, Duration: {'Permanent' if block.is_permanent else f'{duration_days} days'}",
+            now=block.blocked_at,
         )
 
         # Insert audit log (async)
-        insert_audit = f"""
-            INSERT INTO {self.keyspace}.moderator_audit_log
-            (log_id, moderator_id, action, target_user_id, target_id, performed_at, details, ip_address, user_agent)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
         await self.session.aexecute(
-            insert_audit,
+            self._insert_audit_log,
             [
                 audit_log.log_id,
                 audit_log.moderator_id,
@@ -1453,16 +1841,12 @@ class CommentService:
             target_user_id=user_id,
             target_id=block_id,
             details=notes or "Block removed manually",
+            now=now,
         )
 
         # Insert audit log (async)
-        insert_audit = f"""
-            INSERT INTO {self.keyspace}.moderator_audit_log
-            (log_id, moderator_id, action, target_user_id, target_id, performed_at, details, ip_address, user_agent)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
         await self.session.aexecute(
-            insert_audit,
+            self._insert_audit_log,
             [
                 audit_log.log_id,
                 audit_log.moderator_id,
@@ -1523,8 +1907,9 @@ class CommentService:
         # Convert to entities
         blocks = [UserCommentBlock.from_row(row) for row in rows[:limit]]
 
-        # Convert to responses
-        items = [UserBlockResponse.from_block(block) for block in blocks]
+        # Convert to responses, reading the clock once for the whole page
+        now = datetime.now(UTC)
+        items = [UserBlockResponse.from_block(block, now=now) for block in blocks]
 
         return UserBlockListResponse(
             items=items,
@@ -0,0 +1,141 @@
+"""Client IP resolution for requests behind reverse proxies.
+
+The resolver is built once at import time with a fixed header precedence,
+so header names are lowercased and encoded a single time instead of on
+every request. Lookups scan Starlette's raw ASGI header list directly, and
+the user agent can be collected in the same pass.
+"""
+
+from starlette.requests import HTTPConnection
+
+from src.core.context import client_info_var
+
+
+# Proxy headers checked for the originating client IP, highest priority first
+DEFAULT_IP_HEADER_PRECEDENCE = ("x-forwarded-for", "x-real-ip")
+
+_USER_AGENT_HEADER = b"user-agent"
+
+
+class ClientIpResolver:
+    """Resolve the originating client IP from proxy headers.
+
+    Headers are checked in precedence order. For comma-separated chains
+    (X-Forwarded-For), the first entry is the original client. Falls back
+    to the socket peer address when no proxy header is present.
+    """
+
+    def __init__(
+        self, precedence: tuple[str, ...] = DEFAULT_IP_HEADER_PRECEDENCE
+    ) -> None:
+        """Initialize the resolver.
+
+        Args:
+            precedence: Header names to check, highest priority first.
+        """
+        # ASGI servers deliver header names lowercased, so match raw bytes
+        self._rank = {
+            name.lower().encode("latin-1"): rank for rank, name in enumerate(precedence)
+        }
+        self._lowest_rank = len(self._rank)
+
+    def get_client_ip(self, request: HTTPConnection) -> str | None:
+        """Get the client IP address for a request.
+
+        Args:
+            request: The request (or websocket) connection.
+
+        Returns:
+            The client IP address or None.
+        """
+        return self._scan(request, with_user_agent=False)[1]
+
+    def get_client_info(self, request: HTTPConnection) -> tuple[str | None, str | None]:
+        """Get the user agent and client IP in a single header pass.
+
+        Args:
+            request: The request (or websocket) connection.
+
+        Returns:
+            Tuple of (user_agent, ip_address).
+        """
+        return self._scan(request, with_user_agent=True)
+
+    def _scan(
+        self, request: HTTPConnection, *, with_user_agent: bool
+    ) -> tuple[str | None, str | None]:
+        """Walk the raw headers once, stopping as soon as nothing is left."""
+        best_rank = self._lowest_rank
+        best_ip = None
+        user_agent = None
+        need_user_agent = with_user_agent
+        rank_of = self._rank.get
+
+        for name, value in request.headers.raw:
+            if need_user_agent and name == _USER_AGENT_HEADER:
+                user_agent = value.decode("latin-1")
+                need_user_agent = False
+                if best_rank == 0:
+                    break
+                continue
+
+            rank = rank_of(name)
+            if rank is None or rank >= best_rank:
+                continue
+            # partition avoids building a list for the common single-IP case
+            ip = value.partition(b",")[0].strip().decode("latin-1")
+            if ip:
+                best_rank, best_ip = rank, ip
+                if rank == 0 and not need_user_agent:
+                    break
+
+        if not best_ip and request.client:
+            best_ip = request.client.host
+
+        return user_agent, best_ip
+
+
+client_ip_resolver = ClientIpResolver()
+
+
+def get_client_ip(request: HTTPConnection) -> str | None:
+    """Get the client IP address using the shared resolver.
+
+    Args:
+        request: The request (or websocket) connection.
+
+    Returns:
+        The client IP address or None.
+    """
+    return get_client_info(request)[1]
+
+
+def get_client_info(request: HTTPConnection) -> tuple[str | None, str | None]:
+    """Get the user agent and client IP using the shared resolver.
+
+    Memoized per request in a context variable, so the middleware and any
+    number of dependencies share a single header scan.
+
+    Args:
+        request: The request (or websocket) connection.
+
+    Returns:
+        Tuple of (user_agent, ip_address).
+    """
+    scope = request.scope
+    cached = client_info_var.get()
+    if cached is not None and cached[0] is scope:
+        return cached[1]
+
+    client_info = client_ip_resolver.get_client_info(request)
+    client_info_var.set((scope, client_info))
+    return client_info
+
+
+__all__ = [
+    "DEFAULT_IP_HEADER_PRECEDENCE",
+    "ClientIpResolver",
+    "client_ip_resolver",
+    "get_client_info",
+    "get_client_ip",
+]
@@ -15,6 +15,10 @@ request_id_var: ContextVar[str] = ContextVar("request_id", default="")
 user_id_var: ContextVar[str | None] = ContextVar("user_id", default=None)
 trace_id_var: ContextVar[str | None] = ContextVar("trace_id", default=None)
 correlation_id_var: ContextVar[str | None] = ContextVar("correlation_id", default=None)
+# (ASGI scope, (user_agent, ip)) memo; the scope ties the value to one request
+client_info_var: ContextVar[
+    tuple[dict[str, Any], tuple[str | None, str | None]] | None
+] = ContextVar("client_info", default=None)
 
 
 def generate_request_id() -> str:
@@ -123,6 +127,7 @@ def clear_context() -> None:
     user_id_var.set(None)
     trace_id_var.set(None)
     correlation_id_var.set(None)
+    client_info_var.set(None)
 
 
 class RequestContext:
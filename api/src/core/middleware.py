@@ -14,6 +14,7 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
+from src.core.client_ip import get_client_info
 from src.core.context import (
     clear_context,
     set_correlation_id,
@@ -106,13 +107,14 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         should_log = self.log_requests and not self._should_exclude(request.url.path)
 
         if should_log:
+            user_agent, client_ip = get_client_info(request)
             logger.info(
                 "request_started",
                 method=request.method,
                 path=request.url.path,
                 query=str(request.query_params) if request.query_params else None,
-                client_ip=self._get_client_ip(request),
-                user_agent=request.headers.get("user-agent"),
+                client_ip=client_ip,
+                user_agent=user_agent,
             )
 
         try:
@@ -170,32 +172,6 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         """
         return any(path.startswith(excluded) for excluded in self.exclude_paths)
 
-    def _get_client_ip(self, request: Request) -> str | None:
-        """Get the client IP address, handling proxies.
-
-        Args:
-            request: The request object.
-
-        Returns:
-            The client IP address or None.
-        """
-        # Check X-Forwarded-For header (from reverse proxy)
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            # Take the first IP in the chain (original client)
-            return forwarded_for.split(",")[0].strip()
-
-        # Check X-Real-IP header (Nginx)
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
-
-        # Fall back to direct client IP
-        if request.client:
-            return request.client.host
-
-        return None
-
     def _extract_traceparent(self, traceparent: str | None) -> str | None:
         """Extract trace ID from W3C traceparent header.
 
@@ -52,6 +52,18 @@ configure_structlog(settings, log_dir=Path(settings.log_dir))
 
 logger = get_logger(__name__)
 
+# Map status codes to error codes for client-side handling
+HTTP_ERROR_CODES = {
+    400: "bad_request",
+    401: "unauthorized",
+    403: "forbidden",
+    404: "not_found",
+    409: "conflict",
+    422: "unprocessable_entity",
+    429: "rate_limited",
+    500: "internal_error",
+}
+
 
 # Application state for dependency injection
 class AppState:
@@ -125,14 +137,6 @@ def get_notification_service() -> NotificationService:
     return app_state.notification_service
 
 
-def get_verification_service() -> VerificationService:
-    """Get VerificationService instance from app state."""
-    if app_state.verification_service is None:
-        msg = "VerificationService not initialized"
-        raise RuntimeError(msg)
-    return app_state.verification_service
-
-
 def get_registration_link_service() -> RegistrationLinkService:
     """Get RegistrationLinkService instance from app state."""
     if app_state.registration_link_service is None:
@@ -306,6 +310,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
                     keyspace=settings.cassandra_keyspace,
                     email_service=app_state.email_service,
                     auth_service=app_state.auth_service,
+                    redis=redis_client,
                 )
                 await app_state.verification_service.initialize()
                 app.state.verification_service = app_state.verification_service
@@ -502,18 +507,6 @@ def create_app() -> FastAPI:
             method=request.method,
         )
 
-        # Map status codes to error codes for client-side handling
-        status_code_map = {
-            400: "bad_request",
-            401: "unauthorized",
-            403: "forbidden",
-            404: "not_found",
-            409: "conflict",
-            422: "unprocessable_entity",
-            429: "rate_limited",
-            500: "internal_error",
-        }
-
         # Return safe error message to user
         return ORJSONResponse(
             status_code=exc.status_code,
@@ -522,7 +515,7 @@ def create_app() -> FastAPI:
                 "message": str(exc.detail)
                 if exc.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR
                 else "Erro interno do servidor",
-                "code": status_code_map.get(exc.status_code, "http_error"),
+                "code": HTTP_ERROR_CODES.get(exc.status_code, "http_error"),
                 "status_code": exc.status_code,
                 "request_id": request_id,
             },
@@ -655,9 +648,6 @@ from src.acquisitions.dependencies import (  # noqa: E402
     set_auth_service_getter as set_acquisitions_auth_service_getter,
 )
 from src.auth.router import set_auth_service_getter  # noqa: E402
-from src.auth.verification_router import (  # noqa: E402
-    set_verification_service_getter,
-)
 from src.courses.dependencies import (  # noqa: E402
     set_course_service_getter,
     set_lesson_service_getter,
@@ -676,7 +666,6 @@ from src.registration_links.dependencies import (  # noqa: E402
 
 set_auth_service_getter(get_auth_service)
 set_admin_auth_service_getter(get_auth_service)
-set_verification_service_getter(get_verification_service)
 set_course_service_getter(get_course_service)
 set_module_service_getter(get_module_service)
 set_lesson_service_getter(get_lesson_service)
@@ -9,6 +9,7 @@ Business logic for:
 - Parsing @mentions from comment content
 """
 
+import asyncio
 import contextlib
 import json
 import re
@@ -537,16 +538,25 @@ class NotificationService:
             author_avatar: Author's avatar URL
             user_lookup_fn: Async function(name: str) -> User | None
 
+        Each distinct name is looked up once, all lookups run concurrently,
+        and a user mentioned more than once (or under two names) gets a
+        single notification.
+
         Returns:
             List of created notifications
         """
         mentions = extract_mentions(content)
         notifications = []
+        notified_ids = {author_id}  # Don't notify yourself
+
+        # Resolve every distinct name up front, in parallel
+        users = await asyncio.gather(
+            *(user_lookup_fn(name) for name in dict.fromkeys(mentions))
+        )
 
-        for mentioned_name in mentions:
-            # Look up user by name
-            user = await user_lookup_fn(mentioned_name)
-            if user and user.id != author_id:  # Don't notify yourself
+        for user in users:
+            if user and user.id not in notified_ids:
+                notified_ids.add(user.id)
                 notification = await self.notify_mention(
                     mentioned_user_id=user.id,
                     actor_id=author_id,
@@ -0,0 +1,53 @@
+"""Tests for comment content sanitization and spam detection."""
+
+from src.comments.service import is_spam, sanitize_content
+
+
+class TestSanitizeContent:
+    """Tests for sanitize_content."""
+
+    def test_restores_allowed_tags(self):
+        """Allowed formatting tags survive escaping."""
+        assert (
+            sanitize_content("<b>negrito</b> e <code>x</code>")
+            == "<b>negrito</b> e <code>x</code>"
+        )
+
+    def test_escapes_other_markup(self):
+        """Disallowed tags and attributes stay escaped."""
+        assert (
+            sanitize_content('<script>alert(1)</script><b class="x">')
+            == "&lt;script&gt;alert(1)&lt;/script&gt;&lt;b class=&quot;x&quot;&gt;"
+        )
+
+    def test_tag_prefix_is_not_restored(self):
+        """Tags that only start like an allowed one stay escaped."""
+        assert sanitize_content("<iframe>") == "&lt;iframe&gt;"
+
+
+class TestIsSpam:
+    """Tests for is_spam."""
+
+    def test_single_word_is_allowed(self):
+        """Single-word comments skip the other checks."""
+        assert is_spam("VIAGRA") is False
+
+    def test_keyword_is_case_insensitive(self):
+        """Spam keywords match regardless of case."""
+        assert is_spam("Compre agora: CLICK HERE") is True
+
+    def test_regular_comment_passes(self):
+        """Ordinary comments are not spam."""
+        assert is_spam("Otima aula, obrigado professor") is False
+
+    def test_too_many_urls(self):
+        """More than three URLs is spam."""
+        links = " ".join(f"https://exemplo.com/{i}" for i in range(4))
+
+        assert is_spam(f"Veja {links}") is True
+
+    def test_three_urls_are_allowed(self):
+        """Up to three URLs is fine."""
+        links = " ".join(f"https://exemplo.com/{i}" for i in range(3))
+
+        assert is_spam(f"Veja {links}") is False
@@ -0,0 +1,78 @@
+"""Tests for comment edit history."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from cassandra.cluster import Session
+
+from src.comments.service import CommentService
+
+
+@pytest.fixture
+def mock_session():
+    """Mock Cassandra session."""
+    session = Mock(spec=Session)
+    session.prepare = Mock(side_effect=lambda _cql: Mock())
+    session.aexecute = AsyncMock(return_value=[])
+    return session
+
+
+class TestContentHistory:
+    """Tests for CommentService.update_comment and get_content_history."""
+
+    @pytest.mark.asyncio
+    async def test_edit_is_returned_as_history(self, mock_session):
+        """Should record the previous content where get_content_history reads it."""
+        lesson_id, comment_id, author_id = uuid4(), uuid4(), uuid4()
+        created_at = datetime.now(UTC)
+        row = SimpleNamespace(
+            comment_id=comment_id,
+            lesson_id=lesson_id,
+            parent_id=None,
+            author_id=author_id,
+            author_name="Maria",
+            author_avatar=None,
+            content="Primeira versao",
+            is_edited=False,
+            edited_at=None,
+            is_deleted=False,
+            deleted_at=None,
+            deleted_by=None,
+            delete_reason=None,
+            reply_count=0,
+            rating=None,
+            is_review=False,
+            created_at=created_at,
+            updated_at=None,
+        )
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+        mock_session.aexecute.side_effect = [[row], []]
+
+        comment = await service.update_comment(
+            lesson_id, comment_id, created_at, "Segunda versao", author_id
+        )
+
+        # The edit batch ends with the comment_content_history insert
+        _statement, values = mock_session.aexecute.await_args.args
+        history_comment_id, edited_at, previous_content = values[-3:]
+        assert history_comment_id == comment_id
+        assert edited_at == comment.edited_at
+        assert previous_content == "Primeira versao"
+
+        mock_session.aexecute.side_effect = [
+            [
+                SimpleNamespace(
+                    comment_id=history_comment_id,
+                    edited_at=edited_at,
+                    previous_content=previous_content,
+                )
+            ]
+        ]
+        history = await service.get_content_history(comment_id)
+
+        assert mock_session.aexecute.await_args.args[1] == [comment_id]
+        assert [edit.previous_content for edit in history] == ["Primeira versao"]
+        assert history[0].edited_at == comment.edited_at
@@ -0,0 +1,135 @@
+"""Tests for comment listing pagination."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from cassandra.cluster import Session
+
+from src.comments.models import ReactionType
+from src.comments.schemas import encode_cursor
+from src.comments.service import CommentService, InvalidCursorError
+
+
+def _row(lesson_id, created_at):
+    """Build a fake root comment row."""
+    return SimpleNamespace(
+        comment_id=uuid4(),
+        lesson_id=lesson_id,
+        parent_id=None,
+        author_id=uuid4(),
+        author_name="Maria",
+        author_avatar=None,
+        content="Comentario",
+        is_edited=False,
+        edited_at=None,
+        is_deleted=False,
+        deleted_at=None,
+        deleted_by=None,
+        delete_reason=None,
+        reply_count=0,
+        rating=None,
+        is_review=False,
+        created_at=created_at,
+        updated_at=None,
+    )
+
+
+@pytest.fixture
+def mock_session():
+    """Mock Cassandra session."""
+    session = Mock(spec=Session)
+    session.prepare = Mock(return_value=Mock())
+    session.aexecute = AsyncMock(return_value=[])
+    return session
+
+
+class TestGetCommentsTotal:
+    """Tests for the total count in CommentService.get_comments."""
+
+    @pytest.mark.asyncio
+    async def test_first_page_counts_comments(self, mock_session):
+        """Should count the lesson's comments for the first page."""
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+
+        response = await service.get_comments(uuid4())
+
+        assert response.total == 0
+        assert mock_session.aexecute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_skips_count(self, mock_session):
+        """Should not run the count query for later pages."""
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+        cursor = encode_cursor(datetime(2024, 1, 1, tzinfo=UTC), uuid4())
+
+        response = await service.get_comments(uuid4(), cursor=cursor)
+
+        assert response.total is None
+        # Ties at the cursor timestamp plus older rows, no count
+        assert mock_session.aexecute.await_count == 2
+
+
+class TestGetCommentsKeyset:
+    """Tests for keyset pagination in CommentService.get_comments."""
+
+    @pytest.mark.asyncio
+    async def test_includes_rows_sharing_cursor_timestamp(self, mock_session):
+        """Should return same-timestamp rows after the cursor before older ones."""
+        lesson_id = uuid4()
+        created_at = datetime(2024, 1, 1, tzinfo=UTC)
+        cursor_id = uuid4()
+        tie = _row(lesson_id, created_at)
+        older = _row(lesson_id, datetime(2023, 12, 31, tzinfo=UTC))
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+        # Ties, older rows, then empty reaction and reply count lookups
+        mock_session.aexecute.side_effect = [[tie], [older], [], []]
+
+        response = await service.get_comments(
+            lesson_id, cursor=encode_cursor(created_at, cursor_id)
+        )
+
+        assert [item.id for item in response.items] == [
+            tie.comment_id,
+            older.comment_id,
+        ]
+        ties_call = mock_session.aexecute.await_args_list[0]
+        assert ties_call.args[1] == [lesson_id, created_at, cursor_id, 21]
+
+    @pytest.mark.asyncio
+    async def test_malformed_cursor_is_a_comment_error(self, mock_session):
+        """Should reject an undecodable cursor before querying."""
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+
+        with pytest.raises(InvalidCursorError):
+            await service.get_comments(uuid4(), cursor="W10")
+
+        mock_session.aexecute.assert_not_awaited()
+
+
+class TestGetReplies:
+    """Tests for CommentService.get_replies."""
+
+    @pytest.mark.asyncio
+    async def test_builds_typed_responses(self, mock_session):
+        """Should build replies with typed author and user reaction."""
+        lesson_id, parent_id, user_id = uuid4(), uuid4(), uuid4()
+        reply = _row(lesson_id, datetime(2024, 1, 1, tzinfo=UTC))
+        reply.parent_id = parent_id
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+        # Replies, reaction counts, reply counts, then the user's reactions
+        mock_session.aexecute.side_effect = [
+            [reply],
+            [],
+            [],
+            [SimpleNamespace(comment_id=reply.comment_id, reaction_type="love")],
+        ]
+
+        replies = await service.get_replies(lesson_id, parent_id, user_id=user_id)
+
+        assert len(replies) == 1
+        assert replies[0].author.name == "Maria"
+        assert replies[0].user_reaction is ReactionType.LOVE
+        assert replies[0].reactions.total == 0
@@ -0,0 +1,136 @@
+"""Tests for comment entity models."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.comments.models import (
+    DEFAULT_AUTHOR_NAME,
+    CommentReply,
+    ModeratorAction,
+    ReactionCounts,
+    create_audit_log,
+    create_comment,
+    create_user_block,
+)
+
+
+class TestToDict:
+    """Tests for the generated to_dict."""
+
+    def test_comment_converts_ids_and_timestamps(self):
+        """Should stringify UUIDs and datetimes and keep None values."""
+        now = datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)
+        comment = create_comment(
+            lesson_id=uuid4(),
+            author_id=uuid4(),
+            author_name="Maria",
+            content="Otima aula",
+            now=now,
+        )
+
+        data = comment.to_dict()
+
+        assert data["comment_id"] == str(comment.comment_id)
+        assert data["parent_id"] is None
+        assert data["edited_at"] is None
+        assert data["created_at"] == now.isoformat()
+        assert data["reply_count"] == 0
+
+    def test_audit_log_uses_its_own_fields(self):
+        """Should serialize audit log fields, with the action as its value."""
+        log = create_audit_log(
+            moderator_id=uuid4(),
+            action=ModeratorAction.BLOCK_USER,
+            target_user_id=uuid4(),
+        )
+
+        data = log.to_dict()
+
+        assert data["log_id"] == str(log.log_id)
+        assert data["action"] == "block_user"
+        assert data["target_id"] is None
+        assert data["performed_at"] == log.performed_at.isoformat()
+
+
+def _reply_row(**overrides):
+    """Build a fake comments_by_parent row."""
+    values = {
+        "comment_id": uuid4(),
+        "lesson_id": uuid4(),
+        "parent_id": uuid4(),
+        "author_id": uuid4(),
+        "author_name": "Maria",
+        "author_avatar": None,
+        "content": "Resposta",
+        "is_edited": False,
+        "is_deleted": False,
+        "reply_count": 0,
+        "rating": None,
+        "is_review": None,
+        "created_at": datetime(2024, 1, 1),
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestFromRowInterning:
+    """Tests for author string interning in from_row."""
+
+    def test_shares_equal_author_strings(self):
+        """Rows with the same author should share one string object."""
+        # Build equal but distinct strings, as the driver does per row
+        first = CommentReply.from_row(_reply_row(author_name=b"Maria".decode()))
+        second = CommentReply.from_row(_reply_row(author_name=b"Maria".decode()))
+
+        assert first.author_name is second.author_name
+
+    def test_missing_author_name_uses_default(self):
+        """Should fall back to the default author name."""
+        reply = CommentReply.from_row(_reply_row(author_name=None))
+
+        assert reply.author_name == DEFAULT_AUTHOR_NAME
+
+
+class TestReactionCountsTotal:
+    """Tests for the ReactionCounts running total."""
+
+    def test_total_from_initial_counts(self):
+        """Should sum the counts passed at construction."""
+        counts = ReactionCounts(comment_id=uuid4(), counts={"like": 2, "love": 3})
+
+        assert counts.total() == 5
+
+    def test_add_updates_count_and_total(self):
+        """Should keep total in sync with add()."""
+        counts = ReactionCounts(comment_id=uuid4(), counts={"like": 2})
+
+        counts.add("love")
+        counts.add("like", -1)
+
+        assert counts.counts == {"like": 1, "love": 1}
+        assert counts.total() == 2
+
+
+class TestUserBlockIsActive:
+    """Tests for UserCommentBlock.is_active."""
+
+    def test_uses_injected_now(self):
+        """Should compare the expiry against the given time."""
+        blocked_at = datetime(2024, 1, 1, tzinfo=UTC)
+        block = create_user_block(
+            user_id=uuid4(),
+            blocked_by=uuid4(),
+            reason="spam",
+            duration_days=7,
+            now=blocked_at,
+        )
+
+        assert block.is_active(blocked_at + timedelta(days=6))
+        assert not block.is_active(blocked_at + timedelta(days=8))
+
+    def test_permanent_block_is_always_active(self):
+        """Should ignore the clock for permanent blocks."""
+        block = create_user_block(user_id=uuid4(), blocked_by=uuid4(), reason="spam")
+
+        assert block.is_active()
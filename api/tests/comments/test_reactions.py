@@ -0,0 +1,214 @@
+"""Tests for batched per-page reaction and reply lookups."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from cassandra.cluster import Session
+
+from src.comments.models import ReactionType
+from src.comments.service import CommentService
+
+
+@pytest.fixture
+def mock_session():
+    """Mock Cassandra session."""
+    session = Mock(spec=Session)
+    session.prepare = Mock(return_value=Mock())
+    session.aexecute = AsyncMock(return_value=[])
+    return session
+
+
+def _redis_with_cached(cached_hashes):
+    """Mock Redis whose first pipeline returns the given cached hashes."""
+    redis_mock = AsyncMock()
+    read_pipe = Mock()
+    read_pipe.execute = AsyncMock(return_value=cached_hashes)
+    write_pipe = Mock()
+    write_pipe.execute = AsyncMock(return_value=[])
+    redis_mock.pipeline = Mock(side_effect=[read_pipe, write_pipe])
+    return redis_mock, write_pipe
+
+
+class TestGetReactionCountsMany:
+    """Tests for CommentService.get_reaction_counts_many."""
+
+    @pytest.mark.asyncio
+    async def test_single_query_for_uncached_comments(self, mock_session):
+        """Should load all misses in one IN query and skip cached ones."""
+        cached_id, first_id, second_id = uuid4(), uuid4(), uuid4()
+        redis_mock, write_pipe = _redis_with_cached([{b"like": b"2"}, {}, {}])
+        service = CommentService(
+            session=mock_session, keyspace="test_keyspace", redis=redis_mock
+        )
+        mock_session.aexecute.return_value = [
+            SimpleNamespace(comment_id=first_id, reaction_type="love", count=3),
+            SimpleNamespace(comment_id=first_id, reaction_type="sad", count=0),
+        ]
+
+        counts = await service.get_reaction_counts_many(
+            [cached_id, first_id, second_id]
+        )
+
+        assert counts == {
+            cached_id: {"like": 2},
+            first_id: {"love": 3},
+            second_id: {},
+        }
+        mock_session.aexecute.assert_awaited_once()
+        assert mock_session.aexecute.await_args.args[1] == [[first_id, second_id]]
+        write_pipe.hset.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_sums_counter_shards(self, mock_session):
+        """Should add up the shard rows of each reaction type."""
+        comment_id = uuid4()
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+        mock_session.aexecute.return_value = [
+            SimpleNamespace(comment_id=comment_id, reaction_type="like", count=2),
+            SimpleNamespace(comment_id=comment_id, reaction_type="like", count=5),
+            SimpleNamespace(comment_id=comment_id, reaction_type="sad", count=1),
+            SimpleNamespace(comment_id=comment_id, reaction_type="sad", count=-1),
+        ]
+
+        counts = await service.get_reaction_counts_many([comment_id])
+
+        assert counts == {comment_id: {"like": 7}}
+
+    @pytest.mark.asyncio
+    async def test_zero_sum_shards_are_not_cached(self, mock_session):
+        """Should not write an empty hash when the shards cancel out."""
+        comment_id = uuid4()
+        redis_mock, write_pipe = _redis_with_cached([{}])
+        service = CommentService(
+            session=mock_session, keyspace="test_keyspace", redis=redis_mock
+        )
+        # Backfilled reaction (shard -1) removed after the migration
+        mock_session.aexecute.return_value = [
+            SimpleNamespace(comment_id=comment_id, reaction_type="like", count=1),
+            SimpleNamespace(comment_id=comment_id, reaction_type="like", count=-1),
+        ]
+
+        counts = await service.get_reaction_counts_many([comment_id])
+
+        assert counts == {comment_id: {}}
+        write_pipe.hset.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batches_large_pages(self, mock_session):
+        """Should split misses into IN queries of bounded size."""
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+        comment_ids = [uuid4() for _ in range(service.REACTION_COUNTS_BATCH_SIZE + 1)]
+
+        counts = await service.get_reaction_counts_many(comment_ids)
+
+        assert mock_session.aexecute.await_count == 2
+        assert counts == {comment_id: {} for comment_id in comment_ids}
+
+    @pytest.mark.asyncio
+    async def test_empty_input(self, mock_session):
+        """Should not query anything for an empty page."""
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+
+        assert await service.get_reaction_counts_many([]) == {}
+        mock_session.aexecute.assert_not_awaited()
+
+
+class TestCountRepliesMany:
+    """Tests for CommentService.count_replies_many."""
+
+    @pytest.mark.asyncio
+    async def test_groups_counts_in_one_query(self, mock_session):
+        """Should count all parents in one grouped query, defaulting to 0."""
+        lesson_id, first_id, second_id = uuid4(), uuid4(), uuid4()
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+        mock_session.aexecute.return_value = [
+            SimpleNamespace(parent_id=first_id, count=4),
+        ]
+
+        counts = await service.count_replies_many(lesson_id, [first_id, second_id])
+
+        assert counts == {first_id: 4, second_id: 0}
+        mock_session.aexecute.assert_awaited_once()
+        assert mock_session.aexecute.await_args.args[1] == [
+            lesson_id,
+            [first_id, second_id],
+        ]
+
+
+class TestGetUserReactionsMany:
+    """Tests for CommentService.get_user_reactions_many."""
+
+    @pytest.mark.asyncio
+    async def test_reads_user_partition_once(self, mock_session):
+        """Should fetch a page of user reactions in one query."""
+        user_id, first_id, second_id = uuid4(), uuid4(), uuid4()
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+        mock_session.aexecute.return_value = [
+            SimpleNamespace(comment_id=first_id, reaction_type="like"),
+        ]
+
+        reactions = await service.get_user_reactions_many(
+            user_id, [first_id, second_id]
+        )
+
+        assert reactions == {first_id: "like"}
+        mock_session.aexecute.assert_awaited_once()
+        assert mock_session.aexecute.await_args.args[1] == [
+            user_id,
+            [first_id, second_id],
+        ]
+
+
+class TestToggleReaction:
+    """Tests for CommentService.toggle_reaction."""
+
+    @pytest.mark.asyncio
+    async def test_same_reaction_is_removed(self, mock_session):
+        """Should remove a repeated reaction and report it was not added."""
+        comment_id, user_id = uuid4(), uuid4()
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+        mock_session.aexecute.side_effect = [
+            [SimpleNamespace(reaction_type="like")],  # existing reaction
+            [],  # delete reaction
+            [],  # delete user reaction
+            [],  # decrement counter
+            [],  # reaction counts
+        ]
+
+        counts, added = await service.toggle_reaction(
+            comment_id, user_id, ReactionType.LIKE
+        )
+
+        assert counts == {}
+        assert added is False
+        assert mock_session.aexecute.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_new_reaction_is_added(self, mock_session):
+        """Should add a reaction when the user has none."""
+        comment_id, user_id = uuid4(), uuid4()
+        service = CommentService(session=mock_session, keyspace="test_keyspace")
+
+        _counts, added = await service.toggle_reaction(
+            comment_id, user_id, ReactionType.LOVE
+        )
+
+        assert added is True
+        # Lookup, three inserts and the counts read
+        assert mock_session.aexecute.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_drops_cached_counts(self, mock_session):
+        """Should invalidate cached counts before reading them back."""
+        comment_id = uuid4()
+        redis_mock = AsyncMock()
+        redis_mock.hgetall.return_value = {}
+        service = CommentService(
+            session=mock_session, keyspace="test_keyspace", redis=redis_mock
+        )
+
+        await service.toggle_reaction(comment_id, uuid4(), ReactionType.LIKE)
+
+        redis_mock.delete.assert_awaited_once_with(f"reactions:{comment_id}")
@@ -0,0 +1,195 @@
+"""Tests for comment report moderation."""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from cassandra.cluster import Session
+
+from src.comments.models import ReportStatus
+from src.comments.service import CommentService
+
+
+@pytest.fixture
+def mock_session():
+    """Mock Cassandra session."""
+    session = Mock(spec=Session)
+    session.prepare = Mock(side_effect=lambda _cql: Mock())
+    session.aexecute = AsyncMock(return_value=[])
+    return session
+
+
+@pytest.fixture
+def comment_service(mock_session):
+    """Create CommentService instance with mocked dependencies."""
+    return CommentService(session=mock_session, keyspace="test_keyspace")
+
+
+class TestModerateReport:
+    """Tests for CommentService.moderate_report."""
+
+    @pytest.mark.asyncio
+    async def test_moves_report_out_of_pending(self, comment_service, mock_session):
+        """Should delete the pending row and insert under the new status."""
+        comment_id, report_id = uuid4(), uuid4()
+        created_at = datetime(2024, 1, 1)
+        stored = SimpleNamespace(
+            status=ReportStatus.PENDING.value,
+            created_at=created_at,
+            lesson_id=uuid4(),
+            reporter_id=uuid4(),
+            reason="spam",
+        )
+        mock_session.aexecute.side_effect = [[stored], []]
+
+        await comment_service.moderate_report(
+            comment_id=comment_id,
+            report_id=report_id,
+            moderator_id=uuid4(),
+            action="dismiss",
+        )
+
+        _statement, values = mock_session.aexecute.await_args.args
+        assert values[0] == ReportStatus.DISMISSED.value
+        # DELETE from the old status partition
+        assert values[6:9] == [ReportStatus.PENDING.value, created_at, report_id]
+        # INSERT into the new status partition
+        assert values[9:12] == [ReportStatus.DISMISSED.value, created_at, report_id]
+
+    @pytest.mark.asyncio
+    async def test_same_status_keeps_status_row(self, comment_service, mock_session):
+        """Should only update the report when moderated twice the same way."""
+        comment_id, report_id, moderator_id = uuid4(), uuid4(), uuid4()
+        created_at = datetime(2024, 1, 1)
+        stored = SimpleNamespace(
+            status=ReportStatus.PENDING.value,
+            created_at=created_at,
+            lesson_id=uuid4(),
+            reporter_id=uuid4(),
+            reason="spam",
+        )
+        dismissed = SimpleNamespace(**{**vars(stored), "status": "dismissed"})
+        mock_session.aexecute.side_effect = [[stored], [], [dismissed], []]
+
+        for _ in range(2):
+            await comment_service.moderate_report(
+                comment_id=comment_id,
+                report_id=report_id,
+                moderator_id=moderator_id,
+                action="dismiss",
+            )
+
+        first_move, second_update = (
+            call.args for call in mock_session.aexecute.await_args_list[1::2]
+        )
+        assert first_move[1][6:9] == [ReportStatus.PENDING.value, created_at, report_id]
+        # No DELETE + INSERT of the same status row, which would drop it
+        assert first_move[0] is not second_update[0]
+        assert second_update[1] == [
+            ReportStatus.DISMISSED.value,
+            moderator_id,
+            None,
+            second_update[1][3],
+            comment_id,
+            report_id,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unknown_report_is_ignored(self, comment_service, mock_session):
+        """Should not write anything for a report that does not exist."""
+        await comment_service.moderate_report(
+            comment_id=uuid4(),
+            report_id=uuid4(),
+            moderator_id=uuid4(),
+            action="dismiss",
+        )
+
+        mock_session.aexecute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_remove_writes_report_and_delete_together(
+        self, comment_service, mock_session
+    ):
+        """Should update the report and soft delete the comment in one write."""
+        comment_id, report_id, moderator_id = uuid4(), uuid4(), uuid4()
+        lesson_id = uuid4()
+        created_at = datetime(2024, 1, 1)
+        stored = SimpleNamespace(
+            status=ReportStatus.PENDING.value,
+            created_at=created_at,
+            lesson_id=lesson_id,
+            reporter_id=uuid4(),
+            reason="spam",
+        )
+        comment_row = SimpleNamespace(is_deleted=False, parent_id=None)
+        mock_session.aexecute.side_effect = [[stored], [comment_row], []]
+
+        await comment_service.moderate_report(
+            comment_id=comment_id,
+            report_id=report_id,
+            moderator_id=moderator_id,
+            action="remove",
+            notes="ofensivo",
+            lesson_id=lesson_id,
+            created_at=created_at,
+        )
+
+        assert mock_session.aexecute.await_count == 3
+        _statement, values = mock_session.aexecute.await_args.args
+        assert values[0] == ReportStatus.ACTION_TAKEN.value
+        # Soft delete appended after the report values
+        assert values[17:] == [
+            moderator_id,
+            "Removido por moderacao: ofensivo",
+            values[16],
+            lesson_id,
+            created_at,
+            comment_id,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_repeat_remove_keeps_status_row(self, comment_service, mock_session):
+        """Should not move a report already marked action_taken."""
+        comment_id, report_id, moderator_id = uuid4(), uuid4(), uuid4()
+        lesson_id = uuid4()
+        created_at = datetime(2024, 1, 1)
+        stored = SimpleNamespace(
+            status=ReportStatus.ACTION_TAKEN.value,
+            created_at=created_at,
+            lesson_id=lesson_id,
+            reporter_id=uuid4(),
+            reason="spam",
+        )
+        comment_row = SimpleNamespace(is_deleted=False, parent_id=None)
+        mock_session.aexecute.side_effect = [[stored], [comment_row], []]
+
+        await comment_service.moderate_report(
+            comment_id=comment_id,
+            report_id=report_id,
+            moderator_id=moderator_id,
+            action="remove",
+            lesson_id=lesson_id,
+            created_at=created_at,
+        )
+
+        assert mock_session.aexecute.await_count == 3
+        _statement, values = mock_session.aexecute.await_args.args
+        # Report update directly followed by the soft delete, no status rows
+        assert values[:6] == [
+            ReportStatus.ACTION_TAKEN.value,
+            moderator_id,
+            None,
+            values[3],
+            comment_id,
+            report_id,
+        ]
+        assert values[7:] == [
+            moderator_id,
+            "Removido por moderacao: Sem detalhes",
+            values[3],
+            lesson_id,
+            created_at,
+            comment_id,
+        ]
@@ -0,0 +1,124 @@
+"""Tests for comment response schemas."""
+
+import base64
+import json
+import struct
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from src.comments.models import ReactionType, create_comment
+from src.comments.schemas import (
+    MAX_CURSOR_LENGTH,
+    CommentResponse,
+    ReactionCountsResponse,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class TestReactionCountsFromCounts:
+    """Tests for ReactionCountsResponse.from_counts."""
+
+    def test_fills_missing_types_and_total(self):
+        """Missing reaction types default to zero and total is summed."""
+        counts = ReactionCountsResponse.from_counts({"like": 3, "sad": 1})
+
+        assert counts.like == 3
+        assert counts.sad == 1
+        assert counts.love == 0
+        assert counts.total == 4
+
+    def test_accepts_enum_keys(self):
+        """ReactionType members work as keys like their string values."""
+        counts = ReactionCountsResponse.from_counts({ReactionType.LOVE: 2})
+
+        assert counts.love == 2
+        assert counts.total == 2
+
+    def test_ignores_unknown_types(self):
+        """Unknown reaction types do not leak into the total."""
+        counts = ReactionCountsResponse.from_counts({"like": 1, "wow": 5})
+
+        assert counts.total == 1
+
+
+class TestCursor:
+    """Tests for pagination cursor encoding."""
+
+    def test_round_trip(self):
+        """Decoding an encoded cursor returns the same position."""
+        created_at = datetime(2024, 5, 6, 7, 8, 9, 123000, tzinfo=UTC)
+        comment_id = uuid4()
+
+        cursor = encode_cursor(created_at, comment_id)
+
+        assert len(cursor) == 32
+        assert decode_cursor(cursor) == (created_at, comment_id)
+
+    def test_naive_timestamp_is_utc(self):
+        """Naive Cassandra timestamps are encoded as UTC."""
+        comment_id = uuid4()
+
+        cursor = encode_cursor(datetime(2024, 5, 6, 7, 8, 9), comment_id)
+
+        assert decode_cursor(cursor) == (
+            datetime(2024, 5, 6, 7, 8, 9, tzinfo=UTC),
+            comment_id,
+        )
+
+    def test_rejects_oversized_cursor(self):
+        """Overlong cursors are rejected before decoding."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor("A" * (MAX_CURSOR_LENGTH + 1))
+
+    def test_decodes_legacy_json_cursor(self):
+        """Cursors issued in the older JSON layout are still accepted."""
+        created_at = datetime(2024, 5, 6, tzinfo=UTC)
+        comment_id = uuid4()
+        payload = {"created_at": created_at.isoformat(), "comment_id": str(comment_id)}
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        assert decode_cursor(cursor) == (created_at, comment_id)
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            # Binary layout with a timestamp far outside datetime's range
+            struct.pack(">q16s", 2**63 - 1, uuid4().bytes),
+            b"[1, 2]",
+            b'{"created_at": 5, "comment_id": "x"}',
+            b'{"comment_id": "x"}',
+            b"not json",
+        ],
+    )
+    def test_rejects_malformed_cursor(self, raw):
+        """Crafted cursors raise ValueError instead of leaking other errors."""
+        cursor = base64.urlsafe_b64encode(raw).decode()
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor)
+
+
+class TestCommentResponseFromComment:
+    """Tests for CommentResponse.from_comment."""
+
+    def test_matches_validated_response(self):
+        """The constructed response serializes like a validated one."""
+        comment = create_comment(
+            lesson_id=uuid4(),
+            author_id=uuid4(),
+            author_name="Maria",
+            content="Otima aula",
+            rating=4,
+            is_review=True,
+        )
+
+        response = CommentResponse.from_comment(comment, {"like": 2}, "like", 3)
+
+        validated = CommentResponse.model_validate(response.model_dump())
+        assert response.model_dump_json() == validated.model_dump_json()
+        assert response.author.name == "Maria"
+        assert response.reactions.total == 2
+        assert response.user_reaction is ReactionType.LIKE
@@ -0,0 +1,93 @@
+"""Tests for client IP resolution behind reverse proxies."""
+
+from starlette.requests import Request
+
+from src.core.client_ip import ClientIpResolver, get_client_info, get_client_ip
+
+
+def make_request(
+    headers: list[tuple[bytes, bytes]],
+    client: tuple[str, int] | None = ("10.0.0.1", 1234),
+) -> Request:
+    """Build a bare request from raw ASGI headers."""
+    return Request({"type": "http", "headers": headers, "client": client})
+
+
+class TestGetClientIp:
+    """Tests for the shared client IP resolver."""
+
+    def test_uses_first_forwarded_for_entry(self):
+        """Should return the original client from the X-Forwarded-For chain."""
+        request = make_request(
+            [(b"x-forwarded-for", b" 203.0.113.7 , 10.0.0.2, 10.0.0.3")]
+        )
+        assert get_client_ip(request) == "203.0.113.7"
+
+    def test_forwarded_for_takes_precedence_over_real_ip(self):
+        """Should prefer X-Forwarded-For regardless of header order."""
+        request = make_request(
+            [
+                (b"x-real-ip", b"198.51.100.1"),
+                (b"x-forwarded-for", b"203.0.113.7"),
+            ]
+        )
+        assert get_client_ip(request) == "203.0.113.7"
+
+    def test_falls_back_to_real_ip(self):
+        """Should use X-Real-IP when X-Forwarded-For is empty."""
+        request = make_request(
+            [(b"x-forwarded-for", b""), (b"x-real-ip", b"198.51.100.1")]
+        )
+        assert get_client_ip(request) == "198.51.100.1"
+
+    def test_falls_back_to_peer_address(self):
+        """Should use the socket peer when no proxy header is present."""
+        request = make_request([(b"user-agent", b"pytest")])
+        assert get_client_ip(request) == "10.0.0.1"
+
+    def test_returns_none_without_client(self):
+        """Should return None when nothing identifies the client."""
+        assert get_client_ip(make_request([], client=None)) is None
+
+    def test_custom_precedence(self):
+        """Should honour a custom header precedence."""
+        resolver = ClientIpResolver(("CF-Connecting-IP", "X-Forwarded-For"))
+        request = make_request(
+            [
+                (b"x-forwarded-for", b"203.0.113.7"),
+                (b"cf-connecting-ip", b"192.0.2.44"),
+            ]
+        )
+        assert resolver.get_client_ip(request) == "192.0.2.44"
+
+
+class TestGetClientInfo:
+    """Tests for single-pass user agent and IP extraction."""
+
+    def test_returns_user_agent_and_ip(self):
+        """Should collect both values regardless of header order."""
+        request = make_request(
+            [
+                (b"x-forwarded-for", b"203.0.113.7, 10.0.0.2"),
+                (b"user-agent", b"Mozilla/5.0"),
+            ]
+        )
+        assert get_client_info(request) == ("Mozilla/5.0", "203.0.113.7")
+
+    def test_missing_user_agent(self):
+        """Should return None for a missing user agent."""
+        request = make_request([(b"x-real-ip", b"198.51.100.1")])
+        assert get_client_info(request) == (None, "198.51.100.1")
+
+    def test_memoized_per_request(self):
+        """Should reuse the scan for the same request scope only."""
+        request = make_request([(b"x-real-ip", b"198.51.100.1")])
+        assert get_client_info(request) == (None, "198.51.100.1")
+
+        # Same scope (e.g. the endpoint after middleware) hits the memo
+        request.scope["headers"] = [(b"x-real-ip", b"192.0.2.1")]
+        assert get_client_info(Request(request.scope)) == (None, "198.51.100.1")
+
+        # A different request is scanned afresh
+        other = make_request([(b"x-real-ip", b"192.0.2.1")])
+        assert get_client_info(other) == (None, "192.0.2.1")
@@ -169,7 +169,7 @@ export const useCommentsStore = create<CommentsStore>()((set, get) => ({
           ...prev.commentsByLesson,
           [lessonId]: {
             items: response.items,
-            total: response.total,
+            total: response.total ?? 0,
             hasMore: response.has_more,
             nextCursor: response.next_cursor,
           },
@@ -200,7 +200,7 @@ export const useCommentsStore = create<CommentsStore>()((set, get) => ({
           ...prev.commentsByLesson,
           [lessonId]: {
             items: [...(prev.commentsByLesson[lessonId]?.items ?? []), ...response.items],
-            total: response.total,
+            total: response.total ?? prev.commentsByLesson[lessonId]?.total ?? 0,
             hasMore: response.has_more,
             nextCursor: response.next_cursor,
           },
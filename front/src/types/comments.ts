@@ -64,7 +64,8 @@ export interface Comment {
 // Comment list response with pagination
 export interface CommentListResponse {
   items: Comment[];
-  total: number;
+  // Only counted for the first page; null on cursor pages
+  total: number | null;
   has_more: boolean;
   next_cursor: string | null;
 }